@@ -3,18 +3,69 @@ import streamlit as st
 # Must be the first Streamlit command
 st.set_page_config(layout="wide")
 
+import importlib
+import logging
+import time
 import urllib.parse
 from firebase_auth import init_firebase, verify_user
-from date_sum_calculator import date_sum_calculator
-from stock_price_calculators import stock_price_at_degree, degrees_from_stock_price
-from events_workshops import events_workshops
-from blog import blog
-from planetary_ingress_date_generator import planetary_ingress_date_generator
-from combined_page import combined_numerology_and_dob_analyzer
-from orbital_and_gravitational_plotter import orbital_and_gravitational_plotter
-from past_predictions import past_predictions
-from moon_phase_calculator import moon_phase_calculator
-from swing_cycle_projections import run_swing_cycle_projections
+
+SCRIPT_START = time.perf_counter()
+
+# Startup timings go to stderr at INFO (the root logger otherwise only passes warnings)
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+# Sidebar entry -> (module, page function). Page modules are imported only when
+# their entry is first selected, so Home does not pay for astropy, plotly or swisseph.
+PAGES = {
+    "Numerology & DOB Analyzer": ("combined_page", "combined_numerology_and_dob_analyzer"),
+    "Moon Phase Calculator": ("moon_phase_calculator", "moon_phase_calculator"),
+    "Planetary Ingress Dates": ("planetary_ingress_date_generator", "planetary_ingress_date_generator"),
+    "Orbital & Gravitational Plotter": ("orbital_and_gravitational_plotter", "orbital_and_gravitational_plotter"),
+    "Swing & Cycle Projections": ("swing_cycle_projections", "run_swing_cycle_projections"),
+    "Sum of Date Calculator": ("date_sum_calculator", "date_sum_calculator"),
+    "Stock Price by Degree": ("stock_price_calculators", "stock_price_at_degree"),
+    "Degrees from Stock Price": ("stock_price_calculators", "degrees_from_stock_price"),
+    "Events & Workshops": ("events_workshops", "events_workshops"),
+    "Resource Blog": ("blog", "blog"),
+    "Past Predictions": ("past_predictions", "past_predictions"),
+}
+
+@st.cache_resource
+def startup_report():
+    """Process-wide startup timings: the first script run and each page module's first import (seconds)."""
+    return {"first_run": None, "page_imports": {}}
+
+def load_page(app_selection):
+    module_name, function_name = PAGES[app_selection]
+    page_imports = startup_report()["page_imports"]
+    if module_name not in page_imports:
+        import_start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        page_imports[module_name] = time.perf_counter() - import_start
+        logger.info("Imported page module %s in %.3fs", module_name, page_imports[module_name])
+    else:
+        module = importlib.import_module(module_name)
+    return getattr(module, function_name)
+
+def report_first_run():
+    report = startup_report()
+    if report["first_run"] is None:
+        report["first_run"] = time.perf_counter() - SCRIPT_START
+        logger.info("Cold start: first script run took %.3fs", report["first_run"])
+
+def startup_timings_panel():
+    """Sidebar expander with this process's startup timings, shown once an admin has logged in on the blog page."""
+    if not st.session_state.get("admin_logged_in"):
+        return
+    report = startup_report()
+    with st.sidebar.expander("Startup timings"):
+        if report["first_run"] is not None:
+            st.write(f"First script run: {report['first_run']:.3f}s")
+        st.table({
+            "Page module": list(report["page_imports"]),
+            "First import (s)": [round(seconds, 3) for seconds in report["page_imports"].values()],
+        })
 
 def main():
     init_firebase()
@@ -46,6 +97,8 @@ def main():
     # If we reach here, the user is verified
     global_css()
     original_app()
+    report_first_run()
+    startup_timings_panel()
 
 def global_css():
     st.markdown(
@@ -88,20 +141,7 @@ def original_app():
     st.sidebar.markdown('<div class="sidebar-content">', unsafe_allow_html=True)
     app_selection = st.sidebar.radio(
         "Navigation",
-        [
-            "Home",
-            "Numerology & DOB Analyzer",
-            "Moon Phase Calculator",
-            "Planetary Ingress Dates",
-            "Orbital & Gravitational Plotter",
-            "Swing & Cycle Projections",
-            "Sum of Date Calculator",
-            "Stock Price by Degree",
-            "Degrees from Stock Price",
-            "Events & Workshops",
-            "Resource Blog",
-            "Past Predictions"
-        ],
+        ["Home", *PAGES],
         index=0,
         key="app_selection"
     )
@@ -135,28 +175,8 @@ def original_app():
             scrolling=True,
         )
 
-    elif app_selection == "Numerology & DOB Analyzer":
-        combined_numerology_and_dob_analyzer()
-    elif app_selection == "Moon Phase Calculator":
-        moon_phase_calculator()
-    elif app_selection == "Planetary Ingress Dates":
-        planetary_ingress_date_generator()
-    elif app_selection == "Orbital & Gravitational Plotter":
-        orbital_and_gravitational_plotter()
-    elif app_selection == "Swing & Cycle Projections":
-        run_swing_cycle_projections()
-    elif app_selection == "Sum of Date Calculator":
-        date_sum_calculator()
-    elif app_selection == "Stock Price by Degree":
-        stock_price_at_degree()
-    elif app_selection == "Degrees from Stock Price":
-        degrees_from_stock_price()
-    elif app_selection == "Events & Workshops":
-        events_workshops()
-    elif app_selection == "Resource Blog":
-        blog()
-    elif app_selection == "Past Predictions":
-        past_predictions()
+    else:
+        load_page(app_selection)()
 
 if __name__ == "__main__":
     main()
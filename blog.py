@@ -1,21 +1,155 @@
 import streamlit as st
 import pandas as pd
+import datetime
+import os
+import re
+import sqlite3
+from contextlib import closing
 
-def load_posts():
-    try:
-        posts = pd.read_csv('posts.csv')
-    except FileNotFoundError:
-        posts = pd.DataFrame(columns=["Title", "Content"])
-    return posts
+POSTS_DB_PATH = 'posts.db'
+# Posts were kept here before the SQLite store; it is imported once when the database is created
+LEGACY_POSTS_CSV = 'posts.csv'
 
-def save_post(title, content):
-    posts = load_posts()
-    new_post = pd.DataFrame([[title, content]], columns=["Title", "Content"])
-    updated_posts = pd.concat([posts, new_post], ignore_index=True)
-    updated_posts.to_csv('posts.csv', index=False)
+POSTS_PER_PAGE = 10
+SEARCH_RESULTS = 20
+
+# Relative bm25 weight of a match in the title versus the content
+TITLE_WEIGHT = 5.0
+
+# Search words this long also match as prefixes ("merc" finds Mercury); shorter ones would expand to too many terms
+MIN_PREFIX_LENGTH = 3
+
+SCHEMA_VERSION = 2
+
+def connect(path=POSTS_DB_PATH):
+    """
+    Opens a connection to the post store. WAL mode lets readers run while an admin writes, and the
+    busy timeout makes concurrent writers queue instead of failing. Connections are cheap, so each call gets its own.
+    """
+    connection = sqlite3.connect(path, timeout=10, isolation_level=None)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+def init_post_store(path=POSTS_DB_PATH, legacy_csv=LEGACY_POSTS_CSV):
+    """
+    Brings the database up to SCHEMA_VERSION in one transaction: version 1 creates the posts table and
+    imports `legacy_csv`, version 2 adds the full-text index and fills it from the existing posts.
+    """
+    with closing(connect(path)) as connection:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                connection.execute("""
+                    CREATE TABLE IF NOT EXISTS posts (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        title TEXT NOT NULL,
+                        content TEXT NOT NULL,
+                        created_at TEXT NOT NULL
+                    )
+                """)
+                connection.execute("CREATE INDEX IF NOT EXISTS posts_created_at ON posts (created_at, id)")
+                if os.path.exists(legacy_csv):
+                    legacy = pd.read_csv(legacy_csv, dtype=str, keep_default_na=False)
+                    # The CSV has no timestamps; keep its order and stamp the posts with the migration time
+                    migrated_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+                    connection.executemany(
+                        "INSERT INTO posts (title, content, created_at) VALUES (?, ?, ?)",
+                        [(title, content, migrated_at) for title, content in zip(legacy["Title"], legacy["Content"])],
+                    )
+            if version < 2:
+                # Inverted index over title and content; it stores only the index and reads text back from posts
+                connection.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+                        title, content, content='posts', content_rowid='id',
+                        tokenize='unicode61 remove_diacritics 2', prefix='3 4'
+                    )
+                """)
+                # Default ORDER BY rank, so FTS5 ranks inside the index and only the top rows reach the join
+                connection.execute(
+                    "INSERT INTO posts_fts (posts_fts, rank) VALUES ('rank', ?)", (f"bm25({TITLE_WEIGHT}, 1.0)",)
+                )
+                connection.execute("INSERT INTO posts_fts (posts_fts) VALUES ('rebuild')")
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+@st.cache_resource
+def post_store_ready():
+    """Runs the schema setup and CSV migration once per process."""
+    init_post_store()
+    return True
+
+def load_posts(limit=POSTS_PER_PAGE, before=None, path=POSTS_DB_PATH):
+    """
+    A page of posts, newest first. `before` is the (created_at, id) of the last post on the previous page;
+    seeking from it through the created_at index keeps every page equally cheap however deep it is.
+    """
+    with closing(connect(path)) as connection:
+        if before is None:
+            rows = connection.execute(
+                "SELECT id, title, content, created_at FROM posts ORDER BY created_at DESC, id DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        else:
+            rows = connection.execute(
+                "SELECT id, title, content, created_at FROM posts WHERE (created_at, id) < (?, ?) "
+                "ORDER BY created_at DESC, id DESC LIMIT ?",
+                (*before, limit),
+            ).fetchall()
+    return [dict(row) for row in rows]
+
+def save_post(title, content, path=POSTS_DB_PATH):
+    """Appends a post and adds it to the search index in one transaction, and returns its id."""
+    created_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    with closing(connect(path)) as connection:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            post_id = connection.execute(
+                "INSERT INTO posts (title, content, created_at) VALUES (?, ?, ?)", (title, content, created_at)
+            ).lastrowid
+            connection.execute(
+                "INSERT INTO posts_fts (rowid, title, content) VALUES (?, ?, ?)", (post_id, title, content)
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+    return post_id
+
+def search_query(text):
+    """
+    FTS5 query matching posts that contain every word of `text`, words of MIN_PREFIX_LENGTH or more as prefixes.
+    Words are quoted so punctuation in tickers or stray operators cannot break the query syntax.
+    """
+    words = re.findall(r"\w+", text)
+    return " ".join(f'"{word}"*' if len(word) >= MIN_PREFIX_LENGTH else f'"{word}"' for word in words)
+
+def search_posts(text, limit=SEARCH_RESULTS, path=POSTS_DB_PATH):
+    """
+    Posts matching the words in `text`, best bm25 score first (title matches weigh TITLE_WEIGHT times more),
+    each with a snippet of the content around the matches in **bold**. Snippets are built for the top rows only.
+    """
+    query = search_query(text)
+    if not query:
+        return []
+    with closing(connect(path)) as connection:
+        rows = connection.execute(
+            "SELECT posts.id, posts.title, posts.created_at, matches.snippet FROM ("
+            "  SELECT rowid, rank, snippet(posts_fts, 1, '**', '**', '…', 24) AS snippet"
+            "  FROM posts_fts WHERE posts_fts MATCH ? ORDER BY rank LIMIT ?"
+            ") AS matches JOIN posts ON posts.id = matches.rowid ORDER BY matches.rank",
+            (query, limit),
+        ).fetchall()
+    return [dict(row) for row in rows]
 
 def blog():
     st.header("Resource Blog")
+    post_store_ready()
 
     if "admin_logged_in" not in st.session_state:
         st.session_state.admin_logged_in = False
@@ -40,9 +174,36 @@ def blog():
             else:
                 st.error("Title and content cannot be empty")
 
+    st.subheader("Search Posts")
+    search_text = st.text_input("Search by keyword, ticker or planet")
+    if search_text:
+        results = search_posts(search_text)
+        if not results:
+            st.info("No posts match your search.")
+        for result in results:
+            st.write(f"### {result['title']}")
+            st.write(result['snippet'])
+            st.markdown("---")
+
     st.subheader("All Posts")
-    posts = load_posts()
-    for _, post in posts.iterrows():
-        st.write(f"### {post['Title']}")
-        st.write(post['Content'])
+    # Cursors of the pages shown so far, so "Newer posts" can step back without an OFFSET scan
+    if "blog_page_cursors" not in st.session_state:
+        st.session_state.blog_page_cursors = [None]
+    cursor = st.session_state.blog_page_cursors[-1]
+
+    # One extra row tells whether an older page exists
+    posts = load_posts(limit=POSTS_PER_PAGE + 1, before=cursor)
+    has_older = len(posts) > POSTS_PER_PAGE
+    posts = posts[:POSTS_PER_PAGE]
+    for post in posts:
+        st.write(f"### {post['title']}")
+        st.write(post['content'])
         st.markdown("---")
+
+    newer_column, older_column = st.columns(2)
+    if len(st.session_state.blog_page_cursors) > 1 and newer_column.button("Newer posts"):
+        st.session_state.blog_page_cursors.pop()
+        st.rerun()
+    if has_older and older_column.button("Older posts"):
+        st.session_state.blog_page_cursors.append((posts[-1]['created_at'], posts[-1]['id']))
+        st.rerun()
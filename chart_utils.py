@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objs as go
+
+# Points sent to the browser per line trace; roughly one per horizontal pixel of a wide chart
+MAX_POINTS_PER_TRACE = 2000
+
+# Traces with more points than this are drawn with WebGL instead of SVG
+WEBGL_THRESHOLD = 5000
+
+def _as_numeric(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64) or x.dtype == object:
+        # Through DatetimeIndex so tz-aware timestamps (object arrays) become epoch integers too
+        return pd.DatetimeIndex(x).asi8.astype(float)
+    return x.astype(float)
+
+def lttb_indices(x, y, max_points):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+    Returns the sorted indices of at most `max_points` samples that preserve the visual shape of (x, y).
+    """
+    n = len(y)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    x = _as_numeric(x)
+    y = np.asarray(y, dtype=float)
+
+    indices = np.empty(max_points, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    # Bucket edges for the interior points
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+
+    selected = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third triangle vertex
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        bucket_x, bucket_y = x[start:end], y[start:end]
+        areas = np.abs(
+            (x[selected] - avg_x) * (bucket_y - y[selected])
+            - (x[selected] - bucket_x) * (avg_y - y[selected])
+        )
+        if len(areas) == 0 or np.all(np.isnan(areas)):
+            selected = start
+        else:
+            selected = start + int(np.nanargmax(areas))
+        indices[i + 1] = selected
+
+    return np.unique(indices)
+
+def line_trace(x, y, max_points=MAX_POINTS_PER_TRACE, keep=None, **kwargs):
+    """
+    Builds a line trace with at most `max_points` samples (plus any indices in `keep`),
+    switching to Scattergl when the original series exceeds WEBGL_THRESHOLD points.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    indices = lttb_indices(x, y, max_points)
+    if keep is not None and len(keep):
+        indices = np.union1d(indices, np.asarray(keep, dtype=np.int64))
+
+    trace_type = go.Scattergl if len(y) > WEBGL_THRESHOLD else go.Scatter
+    return trace_type(x=x[indices], y=y[indices], **kwargs)
@@ -1,8 +1,14 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import io
 
 def sum_digits(n):
-    return sum(int(d) for d in str(n))
+    total = 0
+    while n:
+        n, digit = divmod(n, 10)
+        total += digit
+    return total
 
 def reduce_to_single_digit(n):
     if n in {11, 22, 33}:
@@ -18,40 +24,228 @@ def reduce_to_single_digit_dob(n):
         n = sum_digits(n)
     return n
 
+CHALDEAN_TABLE = {
+    'A': 1, 'I': 1, 'J': 1, 'Q': 1, 'Y': 1,
+    'B': 2, 'K': 2, 'R': 2,
+    'C': 3, 'G': 3, 'L': 3, 'S': 3,
+    'D': 4, 'M': 4, 'T': 4,
+    'E': 5, 'H': 5, 'N': 5, 'X': 5,
+    'U': 6, 'V': 6, 'W': 6,
+    'O': 7, 'Z': 7,
+    'F': 8, 'P': 8
+}
+
+PYTHAGOREAN_TABLE = {
+    'A': 1, 'B': 2, 'C': 3, 'D': 4, 'E': 5, 'F': 6, 'G': 7, 'H': 8, 'I': 9,
+    'J': 1, 'K': 2, 'L': 3, 'M': 4, 'N': 5, 'O': 6, 'P': 7, 'Q': 8, 'R': 9,
+    'S': 1, 'T': 2, 'U': 3, 'V': 4, 'W': 5, 'X': 6, 'Y': 7, 'Z': 8, ' ': 0,
+    '1': 1, '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, '0': 0
+}
+
+NUMEROLOGY_TABLES = {"Chaldean": CHALDEAN_TABLE, "Pythagorean": PYTHAGOREAN_TABLE}
+
+def byte_table(table):
+    """A 256-entry array giving each byte's letter value; bytes outside `table` count 0."""
+    values = np.zeros(256, dtype=np.int64)
+    for char, value in table.items():
+        values[ord(char)] = value
+    return values
+
+# Compiled once: letter values indexed by ASCII code, for scoring whole lists at a time
+BYTE_TABLES = {system: byte_table(table) for system, table in NUMEROLOGY_TABLES.items()}
+
+# Values reduce_to_single_digit keeps instead of reducing further
+MASTER_NUMBERS = (11, 22, 33)
+
 # Chaldean Numerology functions
 def chaldean_numerology(input_str):
-    numerology_table = {
-        'A': 1, 'I': 1, 'J': 1, 'Q': 1, 'Y': 1,
-        'B': 2, 'K': 2, 'R': 2,
-        'C': 3, 'G': 3, 'L': 3, 'S': 3,
-        'D': 4, 'M': 4, 'T': 4,
-        'E': 5, 'H': 5, 'N': 5, 'X': 5,
-        'U': 6, 'V': 6, 'W': 6,
-        'O': 7, 'Z': 7,
-        'F': 8, 'P': 8
-    }
     total_sum = 0
     for char in input_str.upper():
-        if char in numerology_table:
-            total_sum += numerology_table[char]
+        if char in CHALDEAN_TABLE:
+            total_sum += CHALDEAN_TABLE[char]
     reduced_sum = reduce_to_single_digit(total_sum)
     return reduced_sum
 
 # Pythagorean Numerology functions
 def pythagorean_numerology(input_str):
-    numerology_table = {
-        'A': 1, 'B': 2, 'C': 3, 'D': 4, 'E': 5, 'F': 6, 'G': 7, 'H': 8, 'I': 9,
-        'J': 1, 'K': 2, 'L': 3, 'M': 4, 'N': 5, 'O': 6, 'P': 7, 'Q': 8, 'R': 9,
-        'S': 1, 'T': 2, 'U': 3, 'V': 4, 'W': 5, 'X': 6, 'Y': 7, 'Z': 8, ' ': 0,
-        '1': 1, '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, '0': 0
-    }
     total_sum = 0
     for char in input_str.upper():
-        if char in numerology_table:
-            total_sum += numerology_table[char]
+        if char in PYTHAGOREAN_TABLE:
+            total_sum += PYTHAGOREAN_TABLE[char]
     reduced_sum = reduce_to_single_digit(total_sum)
     return reduced_sum
 
+# Batch scoring functions
+def encode_names(names):
+    """
+    Upper-cases `names` and packs them into one byte buffer with the start offset of each name.
+    Characters outside ASCII never score, so they are replaced by '?' (value 0) without shifting the others.
+    """
+    upper = [str(name).upper().encode("ascii", "replace") for name in names]
+    lengths = np.fromiter((len(name) for name in upper), dtype=np.int64, count=len(upper))
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    return np.frombuffer(b"".join(upper), dtype=np.uint8), offsets
+
+def numerology_sums(names, system, encoded=None):
+    """Raw letter sums of every name under `system` ("Chaldean" or "Pythagorean"), as an int64 array."""
+    buffer, offsets = encoded if encoded is not None else encode_names(names)
+    cumulative = np.concatenate(([0], np.cumsum(BYTE_TABLES[system][buffer])))
+    return cumulative[offsets[1:]] - cumulative[offsets[:-1]]
+
+def reduce_numbers(values):
+    """
+    Array version of reduce_to_single_digit: repeated digit sums down to one digit,
+    stopping at a master number (11, 22, 33) whenever one comes up along the way.
+    """
+    values = np.asarray(values, dtype=np.int64).copy()
+    active = (values >= 10) & ~np.isin(values, MASTER_NUMBERS)
+    while active.any():
+        remaining = values[active]
+        digit_sum = np.zeros_like(remaining)
+        while remaining.any():
+            remaining, digits = np.divmod(remaining, 10)
+            digit_sum += digits
+        values[active] = digit_sum
+        active[active] = (digit_sum >= 10) & ~np.isin(digit_sum, MASTER_NUMBERS)
+    return values
+
+def score_names(names):
+    """Chaldean and Pythagorean raw sums and reduced numbers for every name, as a DataFrame in input order."""
+    names = list(names)
+    encoded = encode_names(names)
+    scores = {"Input": names}
+    for system in NUMEROLOGY_TABLES:
+        sums = numerology_sums(names, system, encoded)
+        scores[f"{system} Sum"] = sums
+        scores[system] = reduce_numbers(sums)
+    return pd.DataFrame(scores)
+
+@st.cache_data(max_entries=4)
+def score_uploaded_names(file_bytes, column):
+    """Scores the non-empty values of `column` in an uploaded CSV."""
+    names = pd.read_csv(io.BytesIO(file_bytes), usecols=[column], dtype=str, keep_default_na=False)[column]
+    return score_names(names[names != ""])
+
+# Reverse lookup functions
+# Every value reduce_to_single_digit can return, in the order the page offers them
+REDUCED_VALUES = [1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 22, 33]
+
+# Index keys pack (reduced, raw sum) into one sortable integer; raw sums stay far below the stride
+KEY_STRIDE = 1 << 32
+
+def index_key(reduced, raw_sum):
+    return np.int64(reduced) * KEY_STRIDE + raw_sum
+
+class NumerologyIndex:
+    """
+    Names sorted per system by (reduced number, raw sum) through one packed int64 key.
+    Looking up a reduced number, or a raw sum within it, is two binary searches on the key array.
+    """
+
+    def __init__(self, names, keys):
+        self.names = names
+        self.keys = keys
+
+    def query(self, system, reduced, raw_sum=None):
+        """Names reducing to `reduced` under `system` (optionally with exactly `raw_sum`), as a DataFrame."""
+        keys = self.keys[system]
+        if raw_sum is None:
+            lo = np.searchsorted(keys, index_key(reduced, 0), side='left')
+            hi = np.searchsorted(keys, index_key(reduced + 1, 0), side='left')
+        else:
+            lo = np.searchsorted(keys, index_key(reduced, raw_sum), side='left')
+            hi = np.searchsorted(keys, index_key(reduced, raw_sum), side='right')
+        return pd.DataFrame({
+            "Name": self.names[system][lo:hi],
+            "Raw Sum": keys[lo:hi] % KEY_STRIDE,
+            system: keys[lo:hi] // KEY_STRIDE,
+        })
+
+def build_numerology_index(names):
+    """Scores each distinct name once under both systems and sorts it into a NumerologyIndex."""
+    names = pd.unique(pd.Series(list(names), dtype=object))
+    encoded = encode_names(names)
+    sorted_names, sorted_keys = {}, {}
+    for system in NUMEROLOGY_TABLES:
+        sums = numerology_sums(names, system, encoded)
+        keys = index_key(reduce_numbers(sums), sums)
+        order = np.argsort(keys, kind='stable')
+        sorted_names[system] = names[order].astype(str)
+        sorted_keys[system] = keys[order]
+    return NumerologyIndex(sorted_names, sorted_keys)
+
+@st.cache_resource(max_entries=4)
+def load_uploaded_index(file_bytes, column):
+    """Index over the non-empty values of `column` in an uploaded CSV, built once per upload."""
+    names = pd.read_csv(io.BytesIO(file_bytes), usecols=[column], dtype=str, keep_default_na=False)[column]
+    return build_numerology_index(names[names != ""])
+
+# Respellings tried by the variant generator, applied to any occurrence (case-insensitive)
+SPELLING_SUBSTITUTIONS = [
+    ("PH", "F"), ("F", "PH"), ("CK", "K"), ("C", "K"), ("K", "C"), ("Y", "I"), ("I", "Y"),
+    ("S", "Z"), ("Z", "S"), ("EE", "I"), ("OO", "U"), ("U", "OO"), ("V", "W"), ("W", "V"),
+    ("X", "KS"), ("KS", "X"), ("G", "J"), ("J", "G"), ("AE", "E"), ("E", "AE"),
+]
+
+# Upper bound on the variants generated for one name
+MAX_VARIANTS = 20000
+
+def match_case(replacement, matched):
+    if matched.isupper() and len(matched) > 1:
+        return replacement.upper()
+    if matched[0].isupper():
+        return replacement.capitalize()
+    return replacement.lower()
+
+def single_edits(name):
+    """Every spelling one edit away: a SPELLING_SUBSTITUTIONS respelling, or doubling / undoubling a letter."""
+    upper = name.upper()
+    for old, new in SPELLING_SUBSTITUTIONS:
+        start = upper.find(old)
+        while start != -1:
+            end = start + len(old)
+            yield name[:start] + match_case(new, name[start:end]) + name[end:]
+            start = upper.find(old, start + 1)
+    for i, char in enumerate(name):
+        if not char.isalpha():
+            continue
+        yield name[:i + 1] + char.lower() + name[i + 1:]
+        if i + 1 < len(name) and upper[i + 1] == upper[i]:
+            yield name[:i + 1] + name[i + 2:]
+
+def spelling_variants(name, max_edits=2, max_variants=MAX_VARIANTS):
+    """Spellings of `name` within `max_edits` edits, breadth first, as {variant: number of edits}."""
+    variants = {name: 0}
+    frontier = [name]
+    for edits in range(1, max_edits + 1):
+        next_frontier = []
+        for current in frontier:
+            for variant in single_edits(current):
+                if variant not in variants:
+                    variants[variant] = edits
+                    next_frontier.append(variant)
+                    if len(variants) >= max_variants:
+                        return variants
+        frontier = next_frontier
+    return variants
+
+def variants_for_target(name, system, reduced, raw_sum=None, max_edits=2):
+    """Spelling variants of `name` that reduce to `reduced` under `system`, fewest edits first, scored in one batch."""
+    variants = spelling_variants(name, max_edits)
+    candidates = list(variants)
+    sums = numerology_sums(candidates, system)
+    reduced_values = reduce_numbers(sums)
+    hits = reduced_values == reduced
+    if raw_sum is not None:
+        hits &= sums == raw_sum
+    found = pd.DataFrame({
+        "Variant": np.asarray(candidates, dtype=object)[hits],
+        "Edits": [variants[candidate] for candidate, hit in zip(candidates, hits) if hit],
+        "Raw Sum": sums[hits],
+        system: reduced_values[hits],
+    })
+    return found.sort_values(["Edits", "Variant"], kind="stable").reset_index(drop=True)
+
 # DOB Analyzer functions
 def analyze_dob(dob):
     day, month, year = dob.split('/')
@@ -122,3 +316,38 @@ def combined_numerology_and_dob_analyzer():
         # Provide a download button for all numerology results
         csv = history_df.to_csv(index=False)
         st.download_button(label="Download Numerology Results CSV", data=csv, file_name='numerology_results.csv', mime='text/csv')
+
+    st.subheader("Batch Numerology Scoring")
+    uploaded_file = st.file_uploader("Upload a CSV of names, tickers or companies", type="csv")
+    if uploaded_file is not None:
+        file_bytes = uploaded_file.getvalue()
+        columns = pd.read_csv(io.BytesIO(file_bytes), nrows=0).columns.tolist()
+        column = st.selectbox("Column to score:", columns)
+        if st.button("Score All"):
+            scores = score_uploaded_names(file_bytes, column)
+            st.write(f"Scored {len(scores)} entries.")
+            st.dataframe(scores)
+            st.download_button(label="Download Batch Numerology CSV", data=scores.to_csv(index=False), file_name='batch_numerology.csv', mime='text/csv')
+
+    st.subheader("Reverse Numerology Lookup")
+    system = st.selectbox("Numerology system:", list(NUMEROLOGY_TABLES))
+    target = st.selectbox("Target number:", REDUCED_VALUES)
+    raw_sum = st.number_input("Exact raw sum (0 for any):", min_value=0, value=0)
+    raw_sum = raw_sum or None
+
+    if uploaded_file is not None:
+        index = load_uploaded_index(file_bytes, column)
+        matches = index.query(system, target, raw_sum)
+        st.write(f"{len(matches)} entries in column '{column}' reduce to {target} ({system}).")
+        st.dataframe(matches)
+        st.download_button(label="Download Reverse Lookup CSV", data=matches.to_csv(index=False), file_name='reverse_numerology.csv', mime='text/csv')
+    else:
+        st.write("Upload a CSV above to search it by number.")
+
+    name = st.text_input("Name to find spellings for:")
+    max_edits = st.slider("Maximum spelling changes:", min_value=1, max_value=3, value=2)
+    if name:
+        variants = variants_for_target(name, system, target, raw_sum, max_edits)
+        st.write(f"{len(variants)} spellings of '{name}' reduce to {target} ({system}).")
+        st.dataframe(variants)
+        st.download_button(label="Download Spelling Variants CSV", data=variants.to_csv(index=False), file_name='numerology_spellings.csv', mime='text/csv')
@@ -1,7 +1,14 @@
 import firebase_admin
 from firebase_admin import credentials, auth
 import streamlit as st
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
+
+# Verified tokens kept per process; each entry also expires with the token's own exp claim
+TOKEN_CACHE_SIZE = 1024
 
 @st.cache_resource
 def init_firebase():
@@ -12,10 +19,57 @@ def init_firebase():
     cred = credentials.Certificate(key_path)
     firebase_admin.initialize_app(cred)
 
-def verify_user(token):
+class TokenCache:
+    """Verified claims by SHA-256 of the token, least recently used first out, dropped at the token's exp."""
+
+    def __init__(self, max_entries=TOKEN_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(token):
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token):
+        key = self.key(token)
+        with self.lock:
+            claims = self.entries.get(key)
+            if claims is None:
+                return None
+            if time.time() >= claims["exp"]:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return claims
+
+    def put(self, token, claims):
+        with self.lock:
+            self.entries[self.key(token)] = claims
+            self.entries.move_to_end(self.key(token))
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+@st.cache_resource
+def get_token_cache():
+    return TokenCache()
+
+def verify_user(token, verifier=None):
+    """
+    Claims of a valid Firebase ID token, or None (with an error shown) if it does not verify.
+    A token verified before is answered from the process cache until it expires, so reruns skip
+    signature checks. `verifier` is a callable taking the token and returning its claims (raising if
+    it is invalid); it defaults to auth.verify_id_token, whose session already caches the signing
+    certificates for their max-age. Tests pass a local one to run without network.
+    """
+    cache = get_token_cache()
+    claims = cache.get(token)
+    if claims is not None:
+        return claims
     try:
-        decoded_token = auth.verify_id_token(token)
-        return decoded_token
+        claims = (verifier or auth.verify_id_token)(token)
     except Exception as e:
         st.error("Error verifying token: " + str(e))
         return None
+    cache.put(token, claims)
+    return claims
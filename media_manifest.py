@@ -0,0 +1,154 @@
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import subprocess
+from PIL import Image, ImageOps
+
+# Originals, and the generated previews plus manifest, both under Streamlit's static root
+MEDIA_DIR = os.path.join("static", "Media")
+PREVIEW_DIR = os.path.join("static", "previews")
+MANIFEST_PATH = os.path.join(PREVIEW_DIR, "manifest.json")
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".avi")
+
+# Previews are fitted inside this box, about the size of the 800px-high slideshow on a wide screen
+PREVIEW_SIZE = (1600, 1200)
+PREVIEW_QUALITY = 82
+
+# Seconds into a video to take the poster frame from (falls back to the first frame for shorter clips)
+POSTER_OFFSET = 1.0
+
+def file_sha256(path, chunk_size=1 << 20):
+    """SHA-256 of a file, read in chunks so large videos are never held in memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def media_kind(file):
+    extension = os.path.splitext(file)[1].lower()
+    if extension in IMAGE_EXTENSIONS:
+        return "image"
+    if extension in VIDEO_EXTENSIONS:
+        return "video"
+    return None
+
+def save_preview(image, path):
+    """Fits `image` into PREVIEW_SIZE and writes it as a progressive JPEG on a black background."""
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail(PREVIEW_SIZE, Image.LANCZOS)
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (0, 0, 0))
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    image.convert("RGB").save(path, "JPEG", quality=PREVIEW_QUALITY, optimize=True, progressive=True)
+
+def image_preview(source, path):
+    """Writes the preview of an image file and returns the original's (width, height)."""
+    with Image.open(source) as image:
+        size = image.size
+        save_preview(image, path)
+    return size
+
+def video_preview(source, path):
+    """
+    Writes a poster frame of a video file with ffmpeg and returns the video's (width, height).
+    Returns (None, None) without a poster when ffmpeg is not installed or cannot decode the file.
+    """
+    if shutil.which("ffmpeg") is None:
+        return None, None
+    for offset in (POSTER_OFFSET, 0.0):
+        result = subprocess.run(
+            ["ffmpeg", "-v", "error", "-y", "-ss", str(offset), "-i", source, "-frames:v", "1", "-f", "image2pipe", "-c:v", "png", "-"],
+            capture_output=True,
+        )
+        if result.returncode == 0 and result.stdout:
+            break
+    else:
+        return None, None
+
+    poster_source = path + ".png"
+    with open(poster_source, "wb") as f:
+        f.write(result.stdout)
+    try:
+        return image_preview(poster_source, path)
+    finally:
+        os.remove(poster_source)
+
+def load_manifest(path=MANIFEST_PATH):
+    """The manifest as a dict keyed by file name, or an empty dict if it has not been built."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return {entry["name"]: entry for entry in json.load(f)["files"]}
+
+def build_media_manifest(media_dir=MEDIA_DIR, preview_dir=PREVIEW_DIR, manifest_path=MANIFEST_PATH):
+    """
+    Scans media_dir and brings previews and manifest up to date.
+    A file whose size and mtime match its manifest entry is skipped; otherwise it is re-hashed and its
+    preview regenerated only if the content changed. Previews are named by content hash, so renames
+    reuse them and browsers can cache them indefinitely. Previews of removed files are deleted.
+    Returns the manifest entries sorted by file name.
+    """
+    os.makedirs(preview_dir, exist_ok=True)
+    previous = load_manifest(manifest_path)
+
+    entries = []
+    for file in sorted(os.listdir(media_dir)):
+        kind = media_kind(file)
+        if kind is None:
+            continue
+        source = os.path.join(media_dir, file)
+        stat = os.stat(source)
+        entry = previous.get(file)
+        if entry and entry["bytes"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            entries.append(entry)
+            continue
+
+        sha256 = file_sha256(source)
+        entry = next((e for e in previous.values() if e["sha256"] == sha256 and e["kind"] == kind), None)
+        if entry is None or not entry["preview"] or not os.path.exists(os.path.join(preview_dir, entry["preview"])):
+            preview = f"{sha256[:16]}.jpg"
+            make_preview = image_preview if kind == "image" else video_preview
+            try:
+                width, height = make_preview(source, os.path.join(preview_dir, preview))
+            except OSError:
+                # Unreadable or truncated file: index it without a preview
+                width, height = None, None
+            if not os.path.exists(os.path.join(preview_dir, preview)):
+                preview = None
+        else:
+            preview, width, height = entry["preview"], entry["width"], entry["height"]
+
+        entries.append({
+            "name": file,
+            "kind": kind,
+            "mime": mimetypes.guess_type(file)[0],
+            "bytes": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha256": sha256,
+            "width": width,
+            "height": height,
+            "preview": preview,
+            "preview_bytes": os.path.getsize(os.path.join(preview_dir, preview)) if preview else None,
+        })
+
+    in_use = {entry["preview"] for entry in entries}
+    for file in os.listdir(preview_dir):
+        if file.endswith(".jpg") and file not in in_use:
+            os.remove(os.path.join(preview_dir, file))
+
+    # Write to a temporary file first so a running app never reads a half-written manifest
+    with open(manifest_path + ".tmp", "w") as f:
+        json.dump({"files": entries}, f, indent=1)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return entries
+
+if __name__ == "__main__":
+    entries = build_media_manifest()
+    print(f"{len(entries)} media files indexed in {MANIFEST_PATH}")
@@ -1,11 +1,14 @@
 import streamlit as st
 import datetime
+import numpy as np
+import pandas as pd
 import swisseph as swe
+from swe_context import swe_context, jd_to_datetime
 
-def calculate_moon_phase(jd):
+def calculate_moon_phase(jd, flags=swe.FLG_SWIEPH):
     # Calculate the moon phase
-    moon_lon = swe.calc_ut(jd, swe.MOON, swe.FLG_SWIEPH)[0][0]
-    sun_lon = swe.calc_ut(jd, swe.SUN, swe.FLG_SWIEPH)[0][0]
+    moon_lon = swe.calc_ut(jd, swe.MOON, flags)[0][0]
+    sun_lon = swe.calc_ut(jd, swe.SUN, flags)[0][0]
     moon_phase = (moon_lon - sun_lon) % 360
     
     return moon_phase, moon_lon
@@ -16,38 +19,154 @@ def zodiac_sign(degree):
     sign_index = int(degree // 30)
     return signs[sign_index]
 
+# Mean length of a lunation in days, used to predict the next syzygy
+SYNODIC_MONTH = 29.530588853
+
+# Syzygies are refined until the Newton step is below this (about one second, in days)
+TIME_TOLERANCE = 1e-5
+
+SIDEREAL_FLAGS = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED
+
+def elongation_rate(jd):
+    """Moon-Sun elongation (0-360°), its daily rate and the Moon's sidereal longitude at Julian date `jd` (UT)."""
+    moon = swe.calc_ut(jd, swe.MOON, SIDEREAL_FLAGS)[0]
+    sun = swe.calc_ut(jd, swe.SUN, SIDEREAL_FLAGS)[0]
+    return (moon[0] - sun[0]) % 360, moon[3] - sun[3], moon[0]
+
+def find_syzygies(jd_start, jd_end):
+    """
+    Exact new and full moons between two Julian dates (UT), using the ayanamsa already set on swisseph.
+    Each syzygy is predicted from the mean synodic rate and refined with Newton steps on the elongation,
+    so a lunation costs a handful of calc_ut calls. Returns a list of (UTC datetime, phase name, Moon sign).
+    """
+    syzygies = []
+    jd = jd_start
+    elongation, _, _ = elongation_rate(jd)
+    target = (int(elongation // 180) + 1) * 180 % 360
+
+    while True:
+        jd += ((target - elongation) % 360) * SYNODIC_MONTH / 360
+        step = 1.0
+        while abs(step) > TIME_TOLERANCE:
+            elongation, rate, moon_lon = elongation_rate(jd)
+            step = ((elongation - target + 180) % 360 - 180) / rate
+            jd -= step
+        if jd >= jd_end:
+            break
+        if jd >= jd_start:
+            phase_name = "New Moon" if target == 0 else "Full Moon"
+            syzygies.append((jd_to_datetime(jd), phase_name, zodiac_sign(moon_lon % 360)))
+        elongation, target = target, (target + 180) % 360
+
+    return syzygies
+
+def find_moon_phases(start_date, end_date, ayanamsa_mode):
+    """New and full moons from start_date (inclusive) to end_date (exclusive), with the Moon's sidereal sign."""
+    jd_start = swe.julday(start_date.year, start_date.month, start_date.day, 0.0)
+    jd_end = swe.julday(end_date.year, end_date.month, end_date.day, 0.0)
+    with swe_context(ayanamsa_mode):
+        return find_syzygies(jd_start, jd_end)
+
 def moon_phase_for_ayanamsa(year, month, ayanamsa_mode):
-    swe.set_sid_mode(ayanamsa_mode)
     start_date = datetime.date(year, month, 1)
     end_date = (start_date + datetime.timedelta(days=32)).replace(day=1)
-    current_date = start_date
-
-    moon_phases = []
-
-    while current_date < end_date:
-        jd = swe.julday(current_date.year, current_date.month, current_date.day)
-        moon_phase, moon_lon = calculate_moon_phase(jd)
-        
-        # Use a smaller tolerance to accurately capture New Moon and Full Moon
-        if abs(moon_phase) < 1 or abs(moon_phase - 360) < 1:
-            phase_name = "New Moon"
-        elif abs(moon_phase - 180) < 1:
-            phase_name = "Full Moon"
-        else:
-            current_date += datetime.timedelta(days=1)
-            continue
-        
-        moon_sign = zodiac_sign(moon_lon)
-        moon_phases.append((current_date, phase_name, moon_sign))
-        current_date += datetime.timedelta(days=1)
+    return find_moon_phases(start_date, end_date, ayanamsa_mode)
+
+TITHI_NAMES = [f"{paksha} {name}" for paksha in ("Shukla", "Krishna") for name in (
+    "Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami", "Shashthi", "Saptami", "Ashtami",
+    "Navami", "Dashami", "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi")]
+TITHI_NAMES.insert(14, "Purnima")
+TITHI_NAMES.append("Amavasya")
+
+QUARTER_NAMES = ["New Moon", "First Quarter", "Full Moon", "Last Quarter"]
+
+NAKSHATRA_NAMES = [
+    "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra", "Punarvasu", "Pushya", "Ashlesha",
+    "Magha", "Purva Phalguni", "Uttara Phalguni", "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha",
+    "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha", "Purva Bhadrapada",
+    "Uttara Bhadrapada", "Revati"
+]
 
-    return moon_phases
+# Grid spacing in days; the Moon moves under 4° per step, less than any boundary spacing below
+CALENDAR_STEP_DAYS = 0.25
+
+# (event, boundary spacing in degrees, quantity it applies to, names indexed by boundary number)
+CALENDAR_EVENTS = [
+    ("Tithi", 12, "elongation", TITHI_NAMES),
+    ("Quarter", 90, "elongation", QUARTER_NAMES),
+    ("Nakshatra", 360 / 27, "moon", NAKSHATRA_NAMES),
+]
+
+def unwrap_degrees(values):
+    """Makes a steadily increasing angle series continuous across the 360° wrap."""
+    return values[0] + np.concatenate(([0.0], np.cumsum(np.diff(values) % 360)))
+
+@st.cache_data(max_entries=16)
+def lunar_calendar(start_date, end_date, ayanamsa_mode):
+    """
+    Every tithi, quarter phase and nakshatra transit from start_date to end_date as one table.
+    Sun and Moon are evaluated on a fixed grid, boundary crossings are located by interpolating the
+    unwrapped elongation / Moon longitude, and each crossing gets one secant correction.
+    Columns: Time (UTC), Event, Number, Name, Moon Sign.
+    """
+    jd_start = swe.julday(start_date.year, start_date.month, start_date.day, 0.0)
+    jd_end = swe.julday(end_date.year, end_date.month, end_date.day, 0.0)
+    grid = np.arange(jd_start, jd_end + CALENDAR_STEP_DAYS, CALENDAR_STEP_DAYS)
+    flags = swe.FLG_SWIEPH | swe.FLG_SIDEREAL
+
+    with swe_context(ayanamsa_mode):
+        samples = np.array([calculate_moon_phase(jd, flags) for jd in grid])
+        series = {"elongation": unwrap_degrees(samples[:, 0]), "moon": unwrap_degrees(samples[:, 1])}
+
+        columns = {"jd": [], "Event": [], "Number": [], "Name": [], "moon": []}
+        for event, spacing, quantity, names in CALENDAR_EVENTS:
+            values = series[quantity]
+            index = np.floor(values / spacing).astype(np.int64)
+            steps = np.flatnonzero(np.diff(index))
+            boundary = index[steps + 1] * spacing
+            slope = (values[steps + 1] - values[steps]) / CALENDAR_STEP_DAYS
+            jd_guess = grid[steps] + (boundary - values[steps]) / slope
+
+            # One secant correction using the bracket's slope brings the error well under a minute
+            refined = np.array([calculate_moon_phase(jd, flags) for jd in jd_guess]).reshape(-1, 2)
+            value_now = refined[:, 0] if quantity == "elongation" else refined[:, 1]
+            jd_exact = jd_guess - ((value_now - boundary + 180) % 360 - 180) / slope
+
+            number = index[steps + 1] % len(names)
+            columns["jd"].append(jd_exact)
+            columns["Event"].append(np.full(len(steps), event))
+            columns["Number"].append(number + 1)
+            columns["Name"].append(np.asarray(names, dtype=object)[number])
+            # A nakshatra starts exactly on its boundary, which may also be a sign boundary
+            columns["moon"].append(boundary if quantity == "moon" else refined[:, 1])
+
+    jd = np.concatenate(columns["jd"])
+    calendar = pd.DataFrame({
+        "Time": pd.to_datetime((jd - 2440587.5) * 86400, unit="s").round("min"),
+        "Event": np.concatenate(columns["Event"]),
+        "Number": np.concatenate(columns["Number"]),
+        "Name": np.concatenate(columns["Name"]),
+        "Moon Sign": [zodiac_sign(lon % 360) for lon in np.concatenate(columns["moon"])],
+    })
+    calendar = calendar[(jd >= jd_start) & (jd < jd_end)]
+    return calendar.sort_values("Time", kind="stable").reset_index(drop=True)
 
 def moon_phase_calculator():
     st.title("Moon Phase Calculator")
     
-    year = st.number_input("Enter the year (e.g., 2024):", min_value=1900, max_value=2100, value=2024)
-    month = st.number_input("Enter the month (1-12):", min_value=1, max_value=12, value=7)
+    period = st.radio("Select the period:", ["Month", "Date range"])
+    if period == "Month":
+        year = st.number_input("Enter the year (e.g., 2024):", min_value=1900, max_value=2100, value=2024)
+        month = st.number_input("Enter the month (1-12):", min_value=1, max_value=12, value=7)
+        start_date = datetime.date(year, month, 1)
+        end_date = (start_date + datetime.timedelta(days=32)).replace(day=1)
+    else:
+        min_date, max_date = datetime.date(1900, 1, 1), datetime.date(2100, 12, 31)
+        start_date = st.date_input("Start date:", value=datetime.date(2024, 1, 1), min_value=min_date, max_value=max_date)
+        end_date = st.date_input("End date:", value=datetime.date(2025, 1, 1), min_value=min_date, max_value=max_date)
+        if end_date <= start_date:
+            st.error("End date must be after the start date.")
+            return
     
     ayanamsa_option = st.selectbox("Select the Ayanamsa mode:", ["Sidereal", "Krishnamurthy"])
     
@@ -57,10 +176,21 @@ def moon_phase_calculator():
         ayanamsa_mode = swe.SIDM_KRISHNAMURTI
 
     if st.button("Calculate Moon Phases"):
-        moon_phases = moon_phase_for_ayanamsa(year, month, ayanamsa_mode)
-        st.subheader(f"Full Moon and New Moon Phases for {year}-{month} using {ayanamsa_option} Ayanamsa:")
+        if period == "Month":
+            moon_phases = moon_phase_for_ayanamsa(year, month, ayanamsa_mode)
+            period_label = f"{year}-{month}"
+        else:
+            moon_phases = find_moon_phases(start_date, end_date, ayanamsa_mode)
+            period_label = f"{start_date} to {end_date}"
+        st.subheader(f"Full Moon and New Moon Phases for {period_label} using {ayanamsa_option} Ayanamsa:")
         for date, phase_name, moon_sign in moon_phases:
-            st.write(f"{date}: {phase_name} in {moon_sign}")
+            st.write(f"{date:%Y-%m-%d %H:%M} UTC: {phase_name} in {moon_sign}")
+
+    if st.button("Generate Lunar Calendar"):
+        calendar = lunar_calendar(start_date, end_date, ayanamsa_mode)
+        st.subheader(f"Tithis, Quarters and Nakshatras from {start_date} to {end_date} (UTC) using {ayanamsa_option} Ayanamsa:")
+        st.dataframe(calendar)
+        st.download_button(label="Download Lunar Calendar CSV", data=calendar.to_csv(index=False), file_name='lunar_calendar.csv', mime='text/csv')
 
 if __name__ == "__main__":
     moon_phase_calculator()
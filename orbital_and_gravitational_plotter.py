@@ -1,11 +1,17 @@
 import streamlit as st
 import numpy as np
+import pandas as pd
 import plotly.graph_objs as go
+from chart_utils import line_trace
 from astropy.time import Time
-from astropy.coordinates import solar_system_ephemeris, get_body, get_sun, SkyCoord, GCRS
-from astropy.constants import G, M_sun, M_earth
+from astropy.coordinates import solar_system_ephemeris, get_body, get_sun, GCRS, CartesianRepresentation
+from astropy.constants import G, M_sun, M_earth, c
+import astropy.units as u
+from jplephem.spk import SPK
 import certifi
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 
 # Set SSL_CERT_FILE to use certifi's certificate bundle
@@ -14,6 +20,25 @@ os.environ['SSL_CERT_FILE'] = certifi.where()
 # Define the path to the local ephemeris file
 EPHEMERIS_PATH = os.path.join(os.getcwd(), 'de421.bsp')
 
+# Ephemeris engines selectable behind get_object_position
+ENGINES = ["astropy", "jplephem"]
+
+# Kernel segment chains (center, target) from the solar system barycenter to each body
+JPL_KERNEL_CHAINS = {
+    'sun': [(0, 10)],
+    'mercury': [(0, 1), (1, 199)],
+    'venus': [(0, 2), (2, 299)],
+    'earth': [(0, 3), (3, 399)],
+    'moon': [(0, 3), (3, 301)],
+    'mars': [(0, 4)],
+    'jupiter': [(0, 5)],
+    'saturn': [(0, 6)],
+    'uranus': [(0, 7)],
+    'neptune': [(0, 8)],
+}
+
+SPEED_OF_LIGHT_KM_PER_DAY = c.to('km/day').value
+
 # Custom get_moon function
 def get_moon(time):
     """
@@ -31,19 +56,39 @@ def gravitational_force(mass1, mass2, distance):
     return (G.value * mass1 * mass2) / (distance ** 2)
 
 def get_declination(obj, time):
-    if obj == 'sun':
-        obj_position = get_sun(time)
-    elif obj == 'moon':
-        obj_position = get_moon(time)
-    else:
-        with solar_system_ephemeris.set(EPHEMERIS_PATH):
-            obj_position = get_body(obj, time)
-    
-    sky_coord = SkyCoord(obj_position)
-    gcrs_coord = sky_coord.transform_to(GCRS(obstime=time))
-    return gcrs_coord.dec.degree
+    # get_sun/get_body already return GCRS coordinates, no re-transform needed
+    return get_object_position(obj, time).dec.degree
 
-def get_object_position(obj, time):
+@st.cache_resource
+def get_jpl_kernel():
+    """
+    Opens the SPK kernel at EPHEMERIS_PATH with jplephem.
+    jplephem memory-maps the file, so every session reads the same kernel pages without copying them.
+    """
+    if not os.path.exists(EPHEMERIS_PATH):
+        st.error("Ephemeris file de421.bsp not found. Please add it to your project root.")
+        st.stop()
+    return SPK.open(EPHEMERIS_PATH)
+
+def jpl_barycentric_position(obj, jd1, jd2=0.0):
+    """Barycentric ICRS position of `obj` in km (shape (3,) or (3, N)) at TDB Julian dates jd1 + jd2."""
+    kernel = get_jpl_kernel()
+    return sum(kernel[center, target].compute(jd1, jd2) for center, target in JPL_KERNEL_CHAINS[obj])
+
+def jpl_geocentric_position(obj, time):
+    """Geocentric ICRS position of `obj` in km, corrected for light travel time."""
+    jd1, jd2 = time.tdb.jd1, time.tdb.jd2
+    earth = jpl_barycentric_position('earth', jd1, jd2)
+    position = jpl_barycentric_position(obj, jd1, jd2) - earth
+    for _ in range(2):
+        light_time = np.sqrt(np.sum(position ** 2, axis=0)) / SPEED_OF_LIGHT_KM_PER_DAY
+        position = jpl_barycentric_position(obj, jd1, jd2 - light_time) - earth
+    return position
+
+def get_object_position(obj, time, engine='astropy'):
+    if engine == 'jplephem':
+        # GCRS axes are aligned with ICRS, so the kernel vector needs no frame transform
+        return GCRS(CartesianRepresentation(jpl_geocentric_position(obj, time) * u.km), obstime=time)
     if obj == 'sun':
         return get_sun(time)
     elif obj == 'moon':
@@ -52,7 +97,109 @@ def get_object_position(obj, time):
         with solar_system_ephemeris.set(EPHEMERIS_PATH):
             return get_body(obj, time)
 
-def plot_data(objects, duration_unit, duration_value, start_date, plot_speed, plot_grav_force, plot_declination):
+def compute_positions(obj, observation_times, engine='astropy'):
+    """
+    Evaluates the ephemeris for `obj` once over the whole `observation_times` array.
+    Returns a DataFrame indexed by datetime with columns distance (m), ra and dec (degrees).
+    """
+    obj_position = get_object_position(obj, observation_times, engine)
+    return pd.DataFrame(
+        {
+            'distance': obj_position.distance.to('m').value,
+            'ra': obj_position.ra.degree,
+            'dec': obj_position.dec.degree,
+        },
+        index=pd.DatetimeIndex(observation_times.datetime, name='Date'),
+    )
+
+def compare_engines(obj, observation_times):
+    """
+    Largest differences between the jplephem and astropy engines for `obj` over `observation_times`.
+    The astropy path also applies annual aberration (up to ~20") and uses its own Sun/Moon models,
+    so differences of tens of arcseconds in RA/Dec are expected; distances agree closely.
+    """
+    jpl = compute_positions(obj, observation_times, 'jplephem')
+    reference = compute_positions(obj, observation_times, 'astropy')
+    ra_diff = (jpl['ra'] - reference['ra'] + 180) % 360 - 180
+    return {
+        'Object': obj,
+        'Max distance difference (relative)': np.max(np.abs(jpl['distance'] / reference['distance'] - 1)),
+        'Max RA difference (arcsec)': np.max(np.abs(ra_diff)) * 3600,
+        'Max Dec difference (arcsec)': np.max(np.abs(jpl['dec'] - reference['dec'])) * 3600,
+    }
+
+class PositionCache:
+    """
+    Process-wide LRU cache of daily position series, keyed by object, engine and (start, duration) window.
+    A request whose window lies inside a cached window of the same object is answered by slicing. One that
+    overlaps or touches a cached window on the same daily grid computes only the missing head and tail days
+    and replaces that entry with the merged window, so panning or extending a range reuses what is cached.
+    Least recently used windows are evicted once the cached frames exceed `max_bytes`.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, obj, engine, start_jd, num_days):
+        """Key of the most recent cached window of `obj` on the same daily grid that overlaps or touches the request."""
+        for key in reversed(self._entries):
+            cached_obj, cached_engine, cached_start_jd, cached_days = key
+            offset = start_jd - cached_start_jd
+            if cached_obj == obj and cached_engine == engine and offset == int(offset) and -num_days <= offset <= cached_days:
+                self._entries.move_to_end(key)
+                return key
+        return None
+
+    def _store(self, key, positions, replaces=None):
+        with self._lock:
+            if replaces in self._entries:
+                self.nbytes -= self._entries.pop(replaces).memory_usage(index=True).sum()
+            if key not in self._entries:
+                self._entries[key] = positions
+                self.nbytes += positions.memory_usage(index=True).sum()
+            while self.nbytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.memory_usage(index=True).sum()
+
+    @staticmethod
+    def _compute(obj, start_jd, num_days, engine):
+        return compute_positions(obj, Time(start_jd + np.arange(num_days), format='jd'), engine)
+
+    def get_positions(self, obj, start_jd, num_days, engine='astropy'):
+        with self._lock:
+            key = self._lookup(obj, engine, start_jd, num_days)
+            cached = self._entries[key] if key is not None else None
+        if cached is None:
+            positions = self._compute(obj, start_jd, num_days, engine)
+            self._store((obj, engine, start_jd, num_days), positions)
+            return positions
+
+        _, _, cached_start_jd, cached_days = key
+        offset = int(start_jd - cached_start_jd)
+        if offset >= 0 and offset + num_days <= cached_days:
+            return cached.iloc[offset:offset + num_days]
+
+        head_days = max(-offset, 0)
+        tail_days = max(offset + num_days - cached_days, 0)
+        parts = [cached]
+        if head_days:
+            parts.insert(0, self._compute(obj, start_jd, head_days, engine))
+        if tail_days:
+            parts.append(self._compute(obj, cached_start_jd + cached_days, tail_days, engine))
+        merged = pd.concat(parts)
+        merged_start_jd = min(start_jd, cached_start_jd)
+        self._store((obj, engine, merged_start_jd, len(merged)), merged, replaces=key)
+        offset = int(start_jd - merged_start_jd)
+        return merged.iloc[offset:offset + num_days]
+
+@st.cache_resource
+def get_position_cache():
+    return PositionCache()
+
+def plot_data(objects, duration_unit, duration_value, start_date, plot_speed, plot_grav_force, plot_declination, engine='astropy', compare=False):
     # Convert duration to days
     duration_days = {
         'years': duration_value * 365,
@@ -66,9 +213,6 @@ def plot_data(objects, duration_unit, duration_value, start_date, plot_speed, pl
     # Convert start_date to the correct format for Time
     observation_start_time = Time(start_date.strftime('%Y-%m-%d'))
 
-    # Create an array of observation times over the specified duration
-    observation_times = Time(np.linspace(observation_start_time.jd, observation_start_time.jd + duration_days, duration_days), format='jd')
-
     # Masses of the planets and Moon (in kg)
     object_masses = {
         'mercury': 3.3011e23,
@@ -85,57 +229,40 @@ def plot_data(objects, duration_unit, duration_value, start_date, plot_speed, pl
 
     mu = G.value * M_sun.value  # Gravitational parameter for the Sun
 
+    # Compute every object's daily positions once (or reuse another session's) and derive all metrics from them
+    position_cache = get_position_cache()
+    positions = {}
+    for obj in objects:
+        if obj not in object_masses:
+            st.error(f"Unknown object: {obj}")
+            continue
+        if plot_speed or plot_grav_force or plot_declination:
+            positions[obj] = position_cache.get_positions(obj, observation_start_time.jd, duration_days, engine)
+
     # Create Plotly figure
     fig = go.Figure()
 
     # Plot orbital speed
     if plot_speed:
-        for obj in objects:
-            if obj not in object_masses:
-                st.error(f"Unknown object: {obj}")
-                continue
-
-            speeds = []
-            for t in observation_times:
-                obj_position = get_object_position(obj, t)
-                distance = obj_position.distance.to('m').value
-                speed = orbital_speed(distance, mu)
-                speeds.append(speed)
-
-            speeds = np.array(speeds)
+        for obj, obj_positions in positions.items():
+            speeds = orbital_speed(obj_positions['distance'].to_numpy(), mu)
             normalized_speeds = (speeds - np.min(speeds)) / (np.max(speeds) - np.min(speeds))
-            fig.add_trace(go.Scatter(x=observation_times.datetime, y=normalized_speeds, mode='lines', name=f'{obj.capitalize()} Orbital Speed'))
+            fig.add_trace(line_trace(obj_positions.index, normalized_speeds, mode='lines', name=f'{obj.capitalize()} Orbital Speed'))
 
     # Plot gravitational force
     if plot_grav_force:
-        for obj in objects:
-            if obj not in object_masses:
-                st.error(f"Unknown object: {obj}")
-                continue
-
+        for obj, obj_positions in positions.items():
             mass = object_masses[obj]
-            forces = []
-            for t in observation_times:
-                obj_position = get_object_position(obj, t)
-                distance = obj_position.distance.to('m').value
-                force = gravitational_force(mass, M_sun.value, distance)
-                forces.append(force)
-
-            forces = np.array(forces)
+            forces = gravitational_force(mass, M_sun.value, obj_positions['distance'].to_numpy())
             normalized_forces = (forces - np.min(forces)) / (np.max(forces) - np.min(forces))
-            fig.add_trace(go.Scatter(x=observation_times.datetime, y=normalized_forces, mode='lines', name=f'{obj.capitalize()} Gravitational Force'))
+            fig.add_trace(line_trace(obj_positions.index, normalized_forces, mode='lines', name=f'{obj.capitalize()} Gravitational Force'))
 
     # Plot declination
     if plot_declination:
-        for obj in objects:
-            declinations = []
-            for t in observation_times:
-                dec = get_declination(obj, t)
-                declinations.append(dec)
-
-            declinations = np.array(declinations)
+        for obj, obj_positions in positions.items():
+            declinations = obj_positions['dec'].to_numpy()
             normalized_declinations = (declinations - np.min(declinations)) / (np.max(declinations) - np.min(declinations))
-            fig.add_trace(go.Scatter(x=observation_times.datetime, y=normalized_declinations, mode='lines', name=f'{obj.capitalize()} Declination'))
+            fig.add_trace(line_trace(obj_positions.index, normalized_declinations, mode='lines', name=f'{obj.capitalize()} Declination'))
 
     # Add today's date as a vertical dotted line if within the range
     today = datetime.today()
@@ -146,6 +273,11 @@ def plot_data(objects, duration_unit, duration_value, start_date, plot_speed, pl
     
     st.plotly_chart(fig)
 
+    if compare and positions:
+        observation_times = Time(observation_start_time.jd + np.arange(duration_days), format='jd')
+        st.subheader("Engine Agreement (jplephem vs astropy)")
+        st.table(pd.DataFrame([compare_engines(obj, observation_times) for obj in positions]))
+
 def orbital_and_gravitational_plotter():
     st.title("Orbital and Gravitational Plotter")
 
@@ -158,8 +290,12 @@ def orbital_and_gravitational_plotter():
     plot_grav_force = st.checkbox("Gravitational Force", value=True)
     plot_declination = st.checkbox("Declination", value=True)
 
+    engine = st.selectbox("Ephemeris engine", ENGINES)
+    compare = engine == 'jplephem' and st.checkbox("Compare with astropy", value=False)
+
     if st.button("Submit"):
         objects = objects_input.strip().lower().split(',')
-        plot_data(objects, duration_unit, duration_value, start_date, plot_speed, plot_grav_force, plot_declination)
+        plot_data(objects, duration_unit, duration_value, start_date, plot_speed, plot_grav_force, plot_declination, engine, compare)
 
-orbital_and_gravitational_plotter()
+if __name__ == "__main__":
+    orbital_and_gravitational_plotter()
@@ -1,6 +1,15 @@
 import streamlit as st
 import os
-import base64
+from urllib.parse import quote
+from media_manifest import MEDIA_DIR, MANIFEST_PATH, build_media_manifest, load_manifest
+
+# Where Streamlit's static file server (server.enableStaticServing) exposes static/Media and static/previews
+MEDIA_URL = "app/static/Media"
+PREVIEW_URL = "app/static/previews"
+
+# Containers browsers declare support for; other videos (.mov, .avi) get no type attribute, since a
+# declared video/quicktime or video/x-msvideo source is skipped outright instead of being tried
+BROWSER_VIDEO_TYPES = ("video/mp4", "video/webm", "video/ogg")
 
 def past_predictions():
     # Remove st.set_page_config from here
@@ -18,29 +27,39 @@ def past_predictions():
     st.title("Past Predictions")
     st.write("Explore past predictions and their outcomes.")
 
-    # Media directory
-    media_dir = "Media"
+    # The gallery renders from the manifest written by media_manifest.py (built here on first use if missing)
+    if not os.path.exists(MANIFEST_PATH):
+        if not os.path.exists(MEDIA_DIR):
+            st.error(f"The '{MEDIA_DIR}' directory does not exist. Please add it to your project.")
+            return
+        build_media_manifest()
 
-    # Verify directory exists
-    if not os.path.exists(media_dir):
-        st.error("The 'Media' directory does not exist. Please add it to your project.")
+    html_content = slideshow_html(os.path.getmtime(MANIFEST_PATH))
+    if html_content is None:
+        st.warning(f"No valid media files found in the '{MEDIA_DIR}' directory.")
         return
 
-    # Filter valid media files
-    media_files = [
-        file for file in os.listdir(media_dir)
-        if file.lower().endswith(("jpg", "jpeg", "png", "mp4", "mov", "avi"))
-    ]
-    if not media_files:
-        st.warning("No valid media files found in the 'Media' directory.")
-        return
+    # Embed HTML
+    st.components.v1.html(html_content, height=800, scrolling=False)
 
-    # Prepare Streamlit-compatible paths
-    def get_encoded_file(file_path):
-        """Encode media files to base64 for embedding in HTML."""
-        with open(file_path, "rb") as f:
-            encoded = base64.b64encode(f.read()).decode("utf-8")
-        return encoded
+def static_url(url_dir, file, version=None):
+    """
+    Relative URL of a file on the static endpoint, which supports HTTP range requests so videos
+    start playing before they are fully downloaded. `version` busts browser caches on change.
+    """
+    url = f"{url_dir}/{quote(file)}"
+    return f"{url}?v={version}" if version else url
+
+@st.cache_data(max_entries=4)
+def slideshow_html(manifest_mtime):
+    """
+    Slideshow page for the current manifest (the mtime argument is the cache key), or None if it is empty.
+    Images are shown as their web-sized previews and link to the original; videos show their poster frame.
+    Slides carry their media URL in data-src and only fetch it when first shown.
+    """
+    entries = list(load_manifest().values())
+    if not entries:
+        return None
 
     # Generate HTML slideshow
     html_content = """
@@ -106,21 +125,22 @@ def past_predictions():
         <div class="slideshow-container">
     """
 
-    for i, file in enumerate(media_files):
-        file_path = os.path.join(media_dir, file)
-        if file.lower().endswith(("jpg", "jpeg", "png")):
-            encoded_file = get_encoded_file(file_path)
+    for i, entry in enumerate(entries):
+        url = static_url(MEDIA_URL, entry["name"], entry["sha256"][:8])
+        preview_url = static_url(PREVIEW_URL, entry["preview"]) if entry["preview"] else None
+        if entry["kind"] == "image":
             html_content += f"""
             <div class="slides">
-                <img src="data:image/jpeg;base64,{encoded_file}" alt="Slide {i+1}">
+                <a href="{url}" target="_blank"><img data-src="{preview_url or url}" alt="Slide {i+1}"></a>
             </div>
             """
-        elif file.lower().endswith(("mp4", "mov", "avi")):
-            encoded_file = get_encoded_file(file_path)
+        else:
+            poster = f' poster="{preview_url}"' if preview_url else ""
+            source_type = f' type="{entry["mime"]}"' if entry["mime"] in BROWSER_VIDEO_TYPES else ""
             html_content += f"""
             <div class="slides">
-                <video controls>
-                    <source src="data:video/mp4;base64,{encoded_file}" type="video/mp4">
+                <video controls preload="none"{poster}>
+                    <source data-src="{url}"{source_type}>
                 </video>
             </div>
             """
@@ -137,8 +157,18 @@ def past_predictions():
                 if (n < 1) { slideIndex = slides.length; }
                 for (let i = 0; i < slides.length; i++) {
                     slides[i].style.display = "none";
+                    let video = slides[i].querySelector("video");
+                    if (video) { video.pause(); }
                 }
-                slides[slideIndex - 1].style.display = "block";
+                let slide = slides[slideIndex - 1];
+                // Fetch the slide's media the first time it is shown
+                let media = slide.querySelector("[data-src]");
+                if (media && !media.getAttribute("src")) {
+                    media.setAttribute("src", media.dataset.src);
+                    let video = slide.querySelector("video");
+                    if (video) { video.load(); }
+                }
+                slide.style.display = "block";
             }
 
             function plusSlides(n) {
@@ -156,5 +186,4 @@ def past_predictions():
     </html>
     """
 
-    # Embed HTML
-    st.components.v1.html(html_content, height=800, scrolling=False)
+    return html_content
@@ -1,67 +1,179 @@
 import streamlit as st
 import datetime  # Importing the datetime module
+import os
+import numpy as np
 import swisseph as swe
+from swe_context import map_in_workers, jd_to_datetime
 
-def find_ingress_dates(year, month, latitude, longitude):
-    start_date = datetime.date(year, month, 1)
-    end_date = (start_date + datetime.timedelta(days=32)).replace(day=1)
-    current_date = start_date
-
-    ingress_dates = {planet: [] for planet in ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]}
-    planet_codes = [swe.SUN, swe.MOON, swe.MARS, swe.MERCURY, swe.JUPITER, swe.VENUS, swe.SATURN]
-
-    swe.set_sid_mode(swe.SIDM_KRISHNAMURTI)
-
-    while current_date < end_date:
-        jd = swe.julday(current_date.year, current_date.month, current_date.day)
-        for planet, code in zip(ingress_dates.keys(), planet_codes):
-            lon = swe.calc_ut(jd, code, swe.FLG_SIDEREAL)[0][0]
-            next_day = current_date + datetime.timedelta(days=1)
-            jd_next = swe.julday(next_day.year, next_day.month, next_day.day)
-            lon_next = swe.calc_ut(jd_next, code, swe.FLG_SIDEREAL)[0][0]
-            if int(lon // 30) != int(lon_next // 30):
-                ingress_dates[planet].append((next_day, int(lon_next // 30) + 1))
-        current_date += datetime.timedelta(days=1)
-
-    return ingress_dates
-
-def find_all_ingress_dates(year, planet_code, latitude, longitude):
-    start_date = datetime.date(year, 1, 1)
-    end_date = datetime.date(year + 1, 1, 1)
-    current_date = start_date
-
-    ingress_dates = []
-
-    swe.set_sid_mode(swe.SIDM_KRISHNAMURTI)
-
-    while current_date < end_date:
-        jd = swe.julday(current_date.year, current_date.month, current_date.day)
-        lon = swe.calc_ut(jd, planet_code, swe.FLG_SIDEREAL)[0][0]
-        next_day = current_date + datetime.timedelta(days=1)
-        jd_next = swe.julday(next_day.year, next_day.month, next_day.day)
-        lon_next = swe.calc_ut(jd_next, planet_code, swe.FLG_SIDEREAL)[0][0]
-        if int(lon // 30) != int(lon_next // 30):
-            ingress_dates.append((next_day, int(lon_next // 30) + 1))
-        current_date += datetime.timedelta(days=1)
-
-    return ingress_dates
-
-def get_lat_long(country):
-    coordinates = {
-        'USA': {
-            'New York': (40.7128, -74.0060),
-            'Los Angeles': (34.0522, -118.2437),
-            'Chicago': (41.8781, -87.6298),
-            'Houston': (29.7604, -95.3698)
-        },
-        'India': {
-            'Delhi': (28.7041, 77.1025),
-            'Mumbai': (19.0760, 72.8777),
-            'Bangalore': (12.9716, 77.5946),
-            'Chennai': (13.0827, 80.2707)
-        }
-    }
-    return coordinates[country]
+PLANETS = {
+    "Sun": swe.SUN,
+    "Moon": swe.MOON,
+    "Mars": swe.MARS,
+    "Mercury": swe.MERCURY,
+    "Jupiter": swe.JUPITER,
+    "Venus": swe.VENUS,
+    "Saturn": swe.SATURN
+}
+
+# Precomputed KP ingress events for the years the page offers
+CATALOG_PATH = os.path.join(os.getcwd(), 'ingress_catalog.npz')
+CATALOG_START_YEAR = 2000
+CATALOG_END_YEAR = 2100
+
+# Coarse bracketing step in days per planet. Each step is short enough that the planet moves well under 30°
+# and passes at most one station, so every sign change between two samples is a single crossing.
+PLANET_STEP_DAYS = {
+    swe.SUN: 10,
+    swe.MOON: 1.5,
+    swe.MERCURY: 5,
+    swe.VENUS: 5,
+    swe.MARS: 10,
+    swe.JUPITER: 20,
+    swe.SATURN: 30,
+}
+
+# Crossings and stations are refined to this tolerance (one minute, in days)
+TIME_TOLERANCE = 1 / 1440
+
+def sidereal_longitude(jd, planet_code):
+    """Sidereal longitude and daily speed of a planet at Julian date `jd` (UT)."""
+    position = swe.calc_ut(jd, planet_code, swe.FLG_SIDEREAL | swe.FLG_SPEED)[0]
+    return position[0], position[3]
+
+def find_station(planet_code, jd_a, speed_a, jd_b):
+    """Bisects the speed sign change between jd_a and jd_b and returns the station's Julian date."""
+    while jd_b - jd_a > TIME_TOLERANCE:
+        jd_mid = (jd_a + jd_b) / 2
+        _, speed_mid = sidereal_longitude(jd_mid, planet_code)
+        if (speed_mid > 0) == (speed_a > 0):
+            jd_a, speed_a = jd_mid, speed_mid
+        else:
+            jd_b = jd_mid
+    return (jd_a + jd_b) / 2
+
+def find_crossing(planet_code, boundary, jd_a, lon_a, jd_b, lon_b):
+    """Refines the crossing of `boundary` between jd_a and jd_b with the Illinois (regula falsi) method."""
+    f_a = (lon_a - boundary + 180) % 360 - 180
+    f_b = (lon_b - boundary + 180) % 360 - 180
+    side = 0
+    while jd_b - jd_a > TIME_TOLERANCE:
+        jd_mid = (jd_a * f_b - jd_b * f_a) / (f_b - f_a)
+        # Fall back to bisection if the secant lands on (or outside) the bracket
+        if not jd_a < jd_mid < jd_b:
+            jd_mid = (jd_a + jd_b) / 2
+        lon_mid, _ = sidereal_longitude(jd_mid, planet_code)
+        f_mid = (lon_mid - boundary + 180) % 360 - 180
+        if f_mid == 0:
+            return jd_mid
+        if (f_mid > 0) == (f_b > 0):
+            jd_b, f_b = jd_mid, f_mid
+            if side == -1:
+                f_a /= 2
+            side = -1
+        else:
+            jd_a, f_a = jd_mid, f_mid
+            if side == 1:
+                f_b /= 2
+            side = 1
+    return (jd_a + jd_b) / 2
+
+def find_ingresses(planet_code, jd_start, jd_end):
+    """
+    Exact sidereal sign ingresses of a planet between two Julian dates (UT), including retrograde re-ingresses.
+    Returns a list of (UTC datetime, sign number 1-12) in time order.
+    """
+    step = PLANET_STEP_DAYS.get(planet_code, 1)
+    ingresses = []
+
+    jd_a = jd_start
+    lon_a, speed_a = sidereal_longitude(jd_a, planet_code)
+    while jd_a < jd_end:
+        jd_b = min(jd_a + step, jd_end)
+        lon_b, speed_b = sidereal_longitude(jd_b, planet_code)
+
+        # Split the step at a station so each piece moves in one direction only
+        pieces = [(jd_a, lon_a, jd_b, lon_b)]
+        if (speed_a > 0) != (speed_b > 0):
+            jd_station = find_station(planet_code, jd_a, speed_a, jd_b)
+            lon_station, _ = sidereal_longitude(jd_station, planet_code)
+            pieces = [(jd_a, lon_a, jd_station, lon_station), (jd_station, lon_station, jd_b, lon_b)]
+
+        for piece_a, piece_lon_a, piece_b, piece_lon_b in pieces:
+            sign_a, sign_b = int(piece_lon_a // 30), int(piece_lon_b // 30)
+            if sign_a == sign_b:
+                continue
+            # Moving forward the boundary is the start of the new sign, moving backward the start of the old one
+            direct = (piece_lon_b - piece_lon_a) % 360 < 180
+            boundary = (sign_b if direct else sign_a) * 30
+            jd_ingress = find_crossing(planet_code, boundary, piece_a, piece_lon_a, piece_b, piece_lon_b)
+            ingresses.append((jd_to_datetime(jd_ingress), sign_b + 1))
+
+        jd_a, lon_a, speed_a = jd_b, lon_b, speed_b
+
+    return ingresses
+
+class IngressCatalog:
+    """
+    Sorted ingress times (datetime64[m], UTC) and sign numbers per planet.
+    Range queries are two binary searches on the planet's time array.
+    """
+
+    def __init__(self, times, signs):
+        self.times = times
+        self.signs = signs
+
+    def query(self, planet, start, end):
+        """Ingresses of `planet` with start <= time < end, as a list of (datetime, sign number)."""
+        times = self.times[planet]
+        lo = np.searchsorted(times, np.datetime64(start, 'm'), side='left')
+        hi = np.searchsorted(times, np.datetime64(end, 'm'), side='left')
+        return list(zip(times[lo:hi].tolist(), self.signs[planet][lo:hi].tolist()))
+
+    def month(self, year, month):
+        start = datetime.datetime(year, month, 1)
+        end = (start + datetime.timedelta(days=32)).replace(day=1)
+        return {planet: self.query(planet, start, end) for planet in PLANETS}
+
+    def year(self, year, planet):
+        return self.query(planet, datetime.datetime(year, 1, 1), datetime.datetime(year + 1, 1, 1))
+
+    def save(self, path):
+        arrays = {}
+        for planet in PLANETS:
+            arrays[f"{planet}_time"] = self.times[planet]
+            arrays[f"{planet}_sign"] = self.signs[planet]
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            times = {planet: data[f"{planet}_time"] for planet in PLANETS}
+            signs = {planet: data[f"{planet}_sign"] for planet in PLANETS}
+        return cls(times, signs)
+
+def build_ingress_catalog(path=CATALOG_PATH, start_year=CATALOG_START_YEAR, end_year=CATALOG_END_YEAR):
+    """Computes every KP ingress of the seven planets from start_year through end_year and writes the catalog."""
+    jd_start = swe.julday(start_year, 1, 1, 0.0)
+    jd_end = swe.julday(end_year + 1, 1, 1, 0.0)
+
+    # Each planet runs in its own worker process with an isolated KP ayanamsa setting
+    all_ingresses = map_in_workers(swe.SIDM_KRISHNAMURTI, find_ingresses, [(code, jd_start, jd_end) for code in PLANETS.values()])
+
+    times, signs = {}, {}
+    for planet, ingresses in zip(PLANETS, all_ingresses):
+        times[planet] = np.array([date for date, _ in ingresses], dtype='datetime64[m]')
+        signs[planet] = np.array([sign for _, sign in ingresses], dtype=np.int8)
+
+    catalog = IngressCatalog(times, signs)
+    catalog.save(path)
+    return catalog
+
+@st.cache_resource
+def load_ingress_catalog():
+    """Loads the on-disk catalog once per process, building it first if the build step has not run."""
+    if os.path.exists(CATALOG_PATH):
+        return IngressCatalog.load(CATALOG_PATH)
+    return build_ingress_catalog()
 
 def planetary_ingress_date_generator():
     st.title("Planetary Ingress date calculator")
@@ -69,37 +181,20 @@ def planetary_ingress_date_generator():
     year = st.number_input("Enter the year (e.g., 2024):", min_value=2000, max_value=2100, value=2024)
     month = st.number_input("Enter the month (1-12):", min_value=1, max_value=12, value=7)
     
-    country = st.selectbox("Select the country:", ['USA', 'India'])
-    
-    cities_dict = get_lat_long(country)
-    city = st.selectbox("Select the city:", list(cities_dict.keys()))
-    latitude, longitude = cities_dict[city]
-
     choice = st.radio("Select the option:", 
                       ["Ingress dates for all planets in the specified month", 
                        "Ingress dates for a specific planet for the entire year"])
     
     if choice == "Ingress dates for all planets in the specified month":
-        ingress_dates = find_ingress_dates(year, month, latitude, longitude)
+        ingress_dates = load_ingress_catalog().month(year, month)
         st.subheader(f"Ingress dates for all planets in {year}-{month}:")
         for planet, dates in ingress_dates.items():
             for date, sign in dates:
-                st.write(f"{planet} enters sign {sign} on {date}")
+                st.write(f"{planet} enters sign {sign} on {date:%Y-%m-%d %H:%M} UTC")
     else:
-        planet_name_to_code = {
-            "Sun": swe.SUN,
-            "Moon": swe.MOON,
-            "Mars": swe.MARS,
-            "Mercury": swe.MERCURY,
-            "Jupiter": swe.JUPITER,
-            "Venus": swe.VENUS,
-            "Saturn": swe.SATURN
-        }
-
-        planet_name = st.selectbox("Select the planet:", list(planet_name_to_code.keys()))
-        planet_code = planet_name_to_code[planet_name]
+        planet_name = st.selectbox("Select the planet:", list(PLANETS.keys()))
 
         st.subheader(f"All ingress dates for {planet_name} in {year}:")
-        all_ingress_dates = find_all_ingress_dates(year, planet_code, latitude, longitude)
+        all_ingress_dates = load_ingress_catalog().year(year, planet_name)
         for date, sign in all_ingress_dates:
-            st.write(f"{planet_name} enters sign {sign} on {date}")
+            st.write(f"{planet_name} enters sign {sign} on {date:%Y-%m-%d %H:%M} UTC")
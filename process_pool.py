@@ -0,0 +1,12 @@
+import streamlit as st
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+@st.cache_resource
+def get_process_pool():
+    """
+    Process-wide pool of worker processes shared by CPU-heavy pages (ephemeris searches, batch scans).
+    Workers are spawned rather than forked because the Streamlit server is multi-threaded.
+    """
+    return ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context('spawn'))
@@ -0,0 +1,35 @@
+import datetime
+import threading
+from contextlib import contextmanager
+import swisseph as swe
+from process_pool import get_process_pool
+
+# swisseph keeps the ayanamsa in process-global state and Streamlit serves each session on its own thread,
+# so a sidereal calculation must hold this lock from set_sid_mode until its last calc_ut call.
+SWE_LOCK = threading.RLock()
+
+@contextmanager
+def swe_context(ayanamsa_mode):
+    """Serializes Swiss Ephemeris access and applies `ayanamsa_mode` for the duration of the block."""
+    with SWE_LOCK:
+        swe.set_sid_mode(ayanamsa_mode)
+        yield
+
+def jd_to_datetime(jd):
+    """UTC datetime for a Julian date, rounded to the minute."""
+    year, month, day, hour = swe.revjul(jd)
+    moment = datetime.datetime(year, month, day) + datetime.timedelta(hours=hour)
+    return (moment + datetime.timedelta(seconds=30)).replace(second=0, microsecond=0)
+
+def _run_in_context(ayanamsa_mode, function, args):
+    with swe_context(ayanamsa_mode):
+        return function(*args)
+
+def map_in_workers(ayanamsa_mode, function, args_list):
+    """
+    Runs function(*args) for every args tuple in worker processes under `ayanamsa_mode`, returning results in order.
+    Each worker has its own copy of the swisseph state, so the ayanamsa set there does not leak into the server.
+    """
+    pool = get_process_pool()
+    futures = [pool.submit(_run_in_context, ayanamsa_mode, function, args) for args in args_list]
+    return [future.result() for future in futures]
@@ -1,28 +1,56 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import bisect
+import hashlib
+import io
 import math
+import os
+import tempfile
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, wait
+from pandas.tseries.api import guess_datetime_format
 import plotly.graph_objects as go
 from streamlit_plotly_events import plotly_events
+from chart_utils import line_trace
+from process_pool import get_process_pool
+
+# Thresholds compared by the sweep table: 1% to 20% in 0.5% steps
+SWEEP_THRESHOLDS = np.round(np.arange(0.01, 0.2001, 0.005), 3)
+
+OHLC_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+# Uploads are parsed in chunks of this many rows so very large files never hold every raw string at once
+CHUNK_ROWS = 500_000
+
+# Parsed uploads are kept here as uncompressed .npz column files named by the upload's SHA-256
+UPLOAD_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'swing_upload_cache')
+
+# Total size of that directory; least recently used files beyond it are deleted (on Cloud Run /tmp is memory)
+UPLOAD_CACHE_MAX_BYTES = 256 * 1024 * 1024
 
 # Helper functions
-def generate_cycle_levels(start=1.0, max_price=1e9):
-    levels = [start]
-    current = start
-    while current < max_price:
-        current = (np.sqrt(current) + 0.25) ** 2
-        levels.append(current)
-    return levels
-
-def get_cycle_fraction(price, levels):
-    if price <= levels[0]:
-        return 0.0
-    if price >= levels[-1]:
-        return (len(levels)-1)/9.0
-    idx = bisect.bisect_right(levels, price)
-    low, high = levels[idx-1], levels[idx]
-    return (idx-1 + (price - low) / (high - low))/9.0
+# Cycle levels are (sqrt(previous) + 0.25)^2 starting at 1, so the n-th level is (1 + n/4)^2
+# and nine levels make one full cycle.
+LEVEL_STEP = 0.25
+LEVELS_PER_CYCLE = 9
+
+def cycle_level(n):
+    """Price of the n-th cycle level (n may be an array)."""
+    return (1 + LEVEL_STEP * np.asarray(n)) ** 2
+
+def cycle_fraction(prices):
+    """
+    Position of each price in the level cycle, in cycles (1.0 = nine levels), with no level list or price cap.
+    Below the first level the fraction is 0.
+    """
+    prices = np.asarray(prices, dtype=float)
+    n = np.floor((np.sqrt(np.maximum(prices, 1.0)) - 1) / LEVEL_STEP)
+    # Guard against sqrt rounding right at a level so n always satisfies level(n) <= price < level(n + 1)
+    n -= prices < cycle_level(n)
+    n += prices >= cycle_level(n + 1)
+    low, high = cycle_level(n), cycle_level(n + 1)
+    fraction = (n + (prices - low) / (high - low)) / LEVELS_PER_CYCLE
+    return np.where(prices <= 1.0, 0.0, fraction)
 
 def get_cycle_label(cf):
     cyc_int = math.floor(cf)
@@ -34,88 +62,504 @@ def get_cycle_label(cf):
         angle_rounded = 0.0
     return f"{cyc_int} & {angle_rounded}°"
 
-def detect_swings(df, threshold=0.05, mode="HighLow"):
-    dates, prices = df["Date"].values, df["Close"].values if mode == "Close" else None
-    highs, lows = (df["High"].values, df["Low"].values) if mode == "HighLow" else (None, None)
+def cycle_label(fractions):
+    """get_cycle_label for every cycle fraction in an array."""
+    return np.array([get_cycle_label(fraction) for fraction in np.asarray(fractions, dtype=float).tolist()], dtype=object)
 
-    swings, trend = [], 'looking_for_low'
-    extreme_price, extreme_index = (lows[0], 0) if mode == 'HighLow' else (prices[0], 0)
+def continue_scan(highs, lows, threshold, looking_for_top, extreme_price, extreme_index):
+    """
+    The swing state machine shared by scan_swings and SwingDetector. Scans every bar of the lists from a
+    given state (extreme_index may be negative for an extreme carried over from earlier bars) and returns
+    the bar indices and prices of the swings it confirms plus the final (looking_for_top, price, index) state.
+    """
+    bars, prices = [], []
+    down, up = 1 - threshold, 1 + threshold
 
-    for k in range(1, len(dates)):
-        price = prices[k] if mode == "Close" else (highs[k] if trend == 'looking_for_top' else lows[k])
-
-        if trend == 'looking_for_top':
+    for k in range(len(lows)):
+        if looking_for_top:
+            price = highs[k]
             if price > extreme_price:
                 extreme_price, extreme_index = price, k
-            elif price < extreme_price * (1 - threshold):
-                swings.append((dates[extreme_index], extreme_price, "Top"))
-                trend, extreme_price, extreme_index = 'looking_for_low', price, k
+            elif price < extreme_price * down:
+                bars.append(extreme_index)
+                prices.append(extreme_price)
+                looking_for_top, extreme_price, extreme_index = False, price, k
         else:
+            price = lows[k]
             if price < extreme_price:
                 extreme_price, extreme_index = price, k
-            elif price > extreme_price * (1 + threshold):
-                swings.append((dates[extreme_index], extreme_price, "Low"))
-                trend, extreme_price, extreme_index = 'looking_for_top', price, k
+            elif price > extreme_price * up:
+                bars.append(extreme_index)
+                prices.append(extreme_price)
+                looking_for_top, extreme_price, extreme_index = True, price, k
 
-    return pd.DataFrame(swings, columns=["Date", "Price", "Type"])
+    return bars, prices, (looking_for_top, extreme_price, extreme_index)
 
-# Main app function
-def main():
-    st.set_page_config(layout="wide")
+def scan_swings(highs, lows, threshold):
+    """
+    Core swing scan over plain Python lists: highs are read while looking for a top and lows while looking
+    for a low (pass the closes as both for Close mode). Returns the bar indices and prices of the confirmed
+    swings, which alternate Low, Top, Low, ...
+    """
+    bars, prices, _ = continue_scan(highs[1:], lows[1:], threshold, False, lows[0], -1)
+    return [bar + 1 for bar in bars], prices
+
+def swing_inputs(df, mode):
+    """Price lists scan_swings reads for `mode`."""
+    if mode == "Close":
+        closes = df["Close"].tolist()
+        return closes, closes
+    return df["High"].tolist(), df["Low"].tolist()
+
+def detect_swings(df, threshold=0.05, mode="HighLow"):
+    bars, prices = scan_swings(*swing_inputs(df, mode), threshold)
+    types = ["Low" if i % 2 == 0 else "Top" for i in range(len(bars))]
+    return pd.DataFrame({"Date": df["Date"].array[bars], "Price": prices, "Type": types}, columns=["Date", "Price", "Type"])
+
+def sweep_thresholds(df, thresholds, mode="HighLow"):
+    """
+    Swing statistics for a whole vector of thresholds from one extraction of the price arrays.
+    Returns a table per threshold with the swing count, the average swing amplitude (% move between
+    consecutive swings) and stability (share of its swings that are also swings at the next larger threshold).
+    """
+    highs, lows = swing_inputs(df, mode)
+    results = [scan_swings(highs, lows, threshold) for threshold in thresholds]
+
+    rows = []
+    for i, (threshold, (bars, prices)) in enumerate(zip(thresholds, results)):
+        prices = np.asarray(prices)
+        amplitude = np.abs(np.diff(prices) / prices[:-1]).mean() * 100 if len(prices) > 1 else np.nan
+        stability = np.isin(bars, results[i + 1][0]).mean() if i + 1 < len(results) and bars else np.nan
+        rows.append((threshold, len(bars), amplitude, stability))
+
+    return pd.DataFrame(rows, columns=["Threshold", "Swings", "Avg Amplitude (%)", "Stability"])
+
+class SwingDetector:
+    """
+    Incremental form of detect_swings for live feeds: bars are fed one at a time (or in small batches)
+    and each Top/Low is returned as soon as it is confirmed, at constant cost per bar.
+    Feeding the same bars gives the same swings as detect_swings.
+    """
+
+    def __init__(self, threshold=0.05, mode="HighLow"):
+        self.threshold = threshold
+        self.mode = mode
+        self.trend = 'looking_for_low'
+        self.extreme_price = None
+        self.extreme_date = None
+
+    def feed(self, dates, highs, lows, closes):
+        """Runs the bars through continue_scan from the current state; returns the (Date, Price, Type) swings confirmed."""
+        if self.mode == "Close":
+            highs = lows = closes
+        if not len(dates):
+            return []
+        if self.extreme_price is None:
+            self.extreme_price, self.extreme_date = lows[0], dates[0]
+            dates, highs, lows = dates[1:], highs[1:], lows[1:]
+
+        looking_for_top = self.trend == 'looking_for_top'
+        bars, prices, (looking_for_top, self.extreme_price, extreme_index) = continue_scan(
+            highs, lows, self.threshold, looking_for_top, self.extreme_price, -1)
+
+        # Index -1 is the extreme carried in from earlier bars
+        swings = []
+        for i, (bar, price) in enumerate(zip(bars, prices)):
+            swing_type = "Top" if (self.trend == 'looking_for_top') == (i % 2 == 0) else "Low"
+            swings.append((self.extreme_date if bar < 0 else dates[bar], price, swing_type))
+        if extreme_index >= 0:
+            self.extreme_date = dates[extreme_index]
+        self.trend = 'looking_for_top' if looking_for_top else 'looking_for_low'
+        return swings
+
+    def update(self, date, high=None, low=None, close=None):
+        """Feeds one bar; returns the (Date, Price, Type) swing it confirms, or None."""
+        swings = self.feed([date], [high], [low], [close])
+        return swings[0] if swings else None
+
+    def update_many(self, df):
+        """Feeds a batch of bars (Date, High, Low, Close columns); returns the swings they confirm as a DataFrame."""
+        swings = self.feed(df["Date"].tolist(), df["High"].tolist(), df["Low"].tolist(), df["Close"].tolist())
+        return pd.DataFrame(swings, columns=["Date", "Price", "Type"])
+
+    def checkpoint(self):
+        """Returns the detector state as a plain dict, to be stored and passed to `restore`."""
+        return {
+            "threshold": self.threshold,
+            "mode": self.mode,
+            "trend": self.trend,
+            "extreme_price": self.extreme_price,
+            "extreme_date": self.extreme_date,
+        }
+
+    @classmethod
+    def restore(cls, state):
+        detector = cls(state["threshold"], state["mode"])
+        detector.trend = state["trend"]
+        detector.extreme_price = state["extreme_price"]
+        detector.extreme_date = state["extreme_date"]
+        return detector
+
+def parse_ohlc_csv(data):
+    """
+    Parses the bytes of an OHLC CSV into Date and float64 Open/High/Low/Close columns, dropping incomplete rows.
+    Thousands separators are handled by the parser and the date format is inferred once from the first dates.
+    """
+    header = pd.read_csv(io.BytesIO(data), nrows=0).columns
+    names = {column.strip(): column for column in header}
+    date_column = names['Date']
+    usecols = [date_column] + [names[col] for col in OHLC_COLUMNS]
+
+    first_dates = pd.read_csv(io.BytesIO(data), usecols=[date_column], dtype=str, nrows=20)[date_column].dropna()
+    date_format = guess_datetime_format(first_dates.iloc[0].strip()) if len(first_dates) else None
+
+    def read_chunks(price_dtype):
+        dtype = {date_column: str, **{names[col]: price_dtype for col in OHLC_COLUMNS}}
+        return pd.read_csv(io.BytesIO(data), usecols=usecols, dtype=dtype, thousands=',', chunksize=CHUNK_ROWS)
+
+    try:
+        chunks = list(read_chunks('float64'))
+    except ValueError:
+        # Non-numeric cells: fall back to reading text and coercing them to NaN
+        chunks = []
+        for chunk in read_chunks(str):
+            for col in OHLC_COLUMNS:
+                chunk[names[col]] = pd.to_numeric(chunk[names[col]].str.replace(',', ''), errors='coerce').astype('float64')
+            chunks.append(chunk)
+
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=usecols)
+    df = df.rename(columns={names[col]: col for col in ['Date'] + OHLC_COLUMNS})
+    df['Date'] = pd.to_datetime(df['Date'], format=date_format, errors='coerce')
+    return df.dropna(subset=['Date'] + OHLC_COLUMNS).reset_index(drop=True)
+
+def save_ohlc_columns(df, path):
+    """
+    Writes the columns of a parsed frame to `path` without object arrays: Date as datetime64[ns]
+    (in UTC when the dates carry an offset) plus its timezone name, '' for tz-naive dates.
+    """
+    dates = df['Date']
+    tz = '' if dates.dt.tz is None else str(dates.dt.tz)
+    if tz:
+        dates = dates.dt.tz_convert('UTC').dt.tz_localize(None)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        np.savez(f, Date=dates.to_numpy('datetime64[ns]'), tz=np.array(tz),
+                 **{col: df[col].to_numpy('float64') for col in OHLC_COLUMNS})
+    os.replace(temp_path, path)
+
+def load_ohlc_columns(path):
+    """Reads a frame written by save_ohlc_columns, restoring the timezone of its dates."""
+    with np.load(path) as columns:
+        df = pd.DataFrame({col: columns[col] for col in ['Date'] + OHLC_COLUMNS})
+        tz = str(columns['tz'])
+    if tz:
+        df['Date'] = df['Date'].dt.tz_localize('UTC').dt.tz_convert(tz)
+    return df
+
+def prune_upload_cache(max_bytes=None):
+    """Deletes the least recently used .npz files of UPLOAD_CACHE_DIR until the rest fit in max_bytes."""
+    max_bytes = UPLOAD_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    files = []
+    for entry in os.scandir(UPLOAD_CACHE_DIR):
+        if entry.name.endswith('.npz'):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+    total = 0
+    for _, size, path in sorted(files, reverse=True):
+        total += size
+        if total > max_bytes:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Already pruned by another session
+                pass
+
+@st.cache_data(max_entries=8)
+def load_ohlc(content_hash, _data):
+    """
+    Parsed OHLC frame for an upload, keyed by the SHA-256 of its bytes. Reruns are served from memory and
+    re-uploads of the same file (in any session or after a restart) from the on-disk column cache.
+    Dates are datetime64[ns] on both paths, tz-aware when the CSV's dates carry an offset.
+    A hit refreshes the file's mtime, so pruning to UPLOAD_CACHE_MAX_BYTES drops the least recently used.
+    """
+    path = os.path.join(UPLOAD_CACHE_DIR, f"{content_hash}.npz")
+    if os.path.exists(path):
+        try:
+            df = load_ohlc_columns(path)
+            os.utime(path)
+            return df
+        except (ValueError, KeyError, FileNotFoundError):
+            # Unreadable or older-format cache file: parse the upload again and replace it
+            pass
+
+    df = parse_ohlc_csv(_data)
+    df['Date'] = df['Date'].dt.as_unit('ns')
+    os.makedirs(UPLOAD_CACHE_DIR, exist_ok=True)
+    save_ohlc_columns(df, path)
+    prune_upload_cache()
+    return df
+
+# Rollups of intraday uploads (only those coarser than the uploaded bars are built)
+INTRADAY_RULES = {"15 Minute": "15min", "Hourly": "1h", "4 Hour": "4h"}
+
+# (level, source level, resample rule); each level is aggregated from a finer one it nests into
+PERIOD_RULES = [("Weekly", "Daily", "W-MON"), ("Monthly", "Daily", "ME"), ("Quarterly", "Monthly", "QE")]
+
+OHLC_AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last'}
+
+def resample_ohlc(df, rule):
+    return df.resample(rule, on='Date').agg(OHLC_AGG).dropna().reset_index()
+
+@st.cache_data(max_entries=8)
+def build_bar_pyramid(content_hash, _df):
+    """
+    Every timeframe of an upload, built once per content hash: intraday rollups (for minute data),
+    Daily, Weekly, Monthly and Quarterly. Each level is a dict of aligned arrays (Date, Open, High,
+    Low, Close), so changing timeframe is a lookup. Prices are float NumPy arrays; Date is the column's
+    own datetime array, which keeps the upload's timezone instead of decaying to objects.
+    """
+    frames = {}
+    dates = _df['Date']
+    if len(dates) and (dates != dates.dt.normalize()).any():
+        bar_spacing = dates.diff().median()
+        frames["Intraday"] = _df
+        for name, rule in INTRADAY_RULES.items():
+            if pd.Timedelta(rule) > bar_spacing:
+                frames[name] = resample_ohlc(_df, rule)
+        frames["Daily"] = resample_ohlc(_df, 'D')
+    else:
+        frames["Daily"] = _df
+    for name, source, rule in PERIOD_RULES:
+        frames[name] = resample_ohlc(frames[source], rule)
+
+    return {
+        name: {'Date': frame['Date'].array, **{col: frame[col].to_numpy() for col in OHLC_COLUMNS}}
+        for name, frame in frames.items()
+    }
+
+def bar_spans(timeframe, dates):
+    """
+    [start, end) of the bars labelled `dates` on a pyramid timeframe. Raw intraday bars are just their
+    timestamp; rollups use resample's labels (left for intraday and Daily, period end for W-MON, ME and QE).
+    """
+    day = pd.Timedelta('1D')
+    days = dates.dt.normalize()
+    if timeframe == "Weekly":
+        return days - 6 * day, days + day
+    if timeframe == "Monthly":
+        return days - pd.offsets.MonthBegin(1), days + day
+    if timeframe == "Quarterly":
+        return days - pd.offsets.MonthBegin(3), days + day
+    if timeframe == "Daily":
+        return days, days + day
+    if timeframe in INTRADAY_RULES:
+        return dates, dates + pd.Timedelta(INTRADAY_RULES[timeframe])
+    return dates, dates + pd.Timedelta(1, 'ns')
+
+def swing_confluence(pyramid, threshold=0.05, mode="HighLow"):
+    """
+    Swings on every timeframe of a pyramid in one table. A swing's Confluence is the number of
+    timeframes with a swing of the same type at the same price on a bar overlapping its own, i.e. the
+    same extreme seen at different resolutions (a weekly swing only matches daily swings inside that week).
+    """
+    frames = []
+    for name, level in pyramid.items():
+        swings = detect_swings(pd.DataFrame(level), threshold, mode).assign(Timeframe=name)
+        swings['Start'], swings['End'] = bar_spans(name, swings['Date'])
+        frames.append(swings)
+    swings = pd.concat(frames, ignore_index=True)
+
+    pairs = swings.reset_index().merge(swings, on=['Type', 'Price'], suffixes=('', '_other'))
+    overlapping = pairs[(pairs['Start'] < pairs['End_other']) & (pairs['Start_other'] < pairs['End'])]
+    swings['Confluence'] = overlapping.groupby('index')['Timeframe_other'].nunique()
+    swings = swings.drop(columns=['Start', 'End'])
+    return swings.sort_values(['Date', 'Confluence'], ascending=[True, False], kind='stable').reset_index(drop=True)
+
+def summarize_symbol(symbol, df, threshold=0.05, mode="HighLow"):
+    """Latest swing, cycle position of the last close and distance to the next cycle level for one symbol."""
+    swings = detect_swings(df, threshold, mode)
+    last_close = df['Close'].iloc[-1]
+    fraction = cycle_fraction([last_close])[0]
+    next_level = cycle_level(math.floor(fraction * LEVELS_PER_CYCLE) + 1)
+    last_swing = swings.iloc[-1] if len(swings) else None
+    return {
+        "Symbol": symbol,
+        "Bars": len(df),
+        "Last Date": df['Date'].iloc[-1],
+        "Last Close": last_close,
+        "Last Swing Date": last_swing["Date"] if last_swing is not None else pd.NaT,
+        "Last Swing Type": last_swing["Type"] if last_swing is not None else None,
+        "Last Swing Price": last_swing["Price"] if last_swing is not None else np.nan,
+        "Cycle Position": cycle_label([fraction])[0],
+        "Next Cycle Level": next_level,
+        "Distance to Next Level (%)": (next_level / last_close - 1) * 100,
+    }
+
+def scan_csv_file(source, member, threshold, mode):
+    """
+    Worker task: reads one CSV (a zip member when `source` is a zip path, else the file at `member`)
+    and returns its summary row, or a row with the error message.
+    """
+    symbol = os.path.splitext(os.path.basename(member))[0]
+    try:
+        if source is None:
+            with open(member, 'rb') as f:
+                data = f.read()
+        else:
+            with zipfile.ZipFile(source) as archive:
+                data = archive.read(member)
+        return summarize_symbol(symbol, parse_ohlc_csv(data), threshold, mode)
+    except Exception as e:
+        return {"Symbol": symbol, "Error": f"{type(e).__name__}: {e}"}
+
+def is_symbol_csv(name):
+    """True for CSV files, skipping the __MACOSX/ folder and ._ resource forks macOS adds to zips."""
+    return (name.lower().endswith('.csv') and not name.startswith('__MACOSX/')
+            and not os.path.basename(name).startswith('._'))
+
+def batch_scan(path, threshold=0.05, mode="HighLow", max_in_flight=None):
+    """
+    Scans every CSV in a directory or zip archive in the worker pool and yields summary rows as they finish.
+    Only `max_in_flight` files (default: two per core) are loaded at any time, so memory stays bounded.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            tasks = [(path, info.filename) for info in archive.infolist()
+                     if not info.is_dir() and is_symbol_csv(info.filename)]
+    else:
+        tasks = [(None, os.path.join(path, name)) for name in sorted(os.listdir(path)) if is_symbol_csv(name)]
+
+    pool = get_process_pool()
+    max_in_flight = max_in_flight or 2 * (os.cpu_count() or 1)
+    pending = set()
+    for source, member in tasks:
+        if len(pending) >= max_in_flight:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+        pending.add(pool.submit(scan_csv_file, source, member, threshold, mode))
+    for future in wait(pending).done:
+        yield future.result()
+
+def batch_scan_page():
+    uploaded_zip = st.file_uploader("📦 Upload a zip of OHLC CSVs (one file per symbol)", type="zip")
+    threshold = st.number_input("Threshold (%)", value=0.05, step=0.01, format="%.2f", key="batch_threshold")
+    swingmode = st.selectbox("Swing Type", ["HighLow", "Close"], key="batch_swingmode")
+
+    if uploaded_zip and st.button("Run Batch Scan"):
+        with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as f:
+            f.write(uploaded_zip.getvalue())
+            zip_path = f.name
+        try:
+            table = st.empty()
+            rows = []
+            for row in batch_scan(zip_path, threshold, swingmode):
+                rows.append(row)
+                if len(rows) % 10 == 0:
+                    table.dataframe(pd.DataFrame(rows))
+        finally:
+            os.remove(zip_path)
+
+        summary = pd.DataFrame(rows)
+        if "Symbol" in summary:
+            summary = summary.sort_values("Symbol").reset_index(drop=True)
+        table.dataframe(summary)
+        st.download_button(label="Download Batch Scan CSV", data=summary.to_csv(index=False), file_name='batch_scan.csv', mime='text/csv')
+
+# Cached page stages. Each is keyed by the upload's content hash plus the settings it depends on;
+# underscore arguments are derived from those keys and are not hashed by Streamlit.
+@st.cache_data(max_entries=32)
+def compute_swings(content_hash, timeframe, threshold, mode, _pyramid):
+    swings_df = detect_swings(pd.DataFrame(_pyramid[timeframe]), threshold, mode)
+    swings_df['CycleFraction'] = cycle_fraction(swings_df['Price'].to_numpy())
+    swings_df['CyclePosition'] = cycle_label(swings_df['CycleFraction'].to_numpy())
+    return swings_df
+
+@st.cache_data(max_entries=16)
+def compute_sweep(content_hash, timeframe, mode, _pyramid):
+    return sweep_thresholds(pd.DataFrame(_pyramid[timeframe]), SWEEP_THRESHOLDS, mode)
+
+@st.cache_data(max_entries=16)
+def compute_confluence(content_hash, threshold, mode, _pyramid):
+    return swing_confluence(_pyramid, threshold, mode)
+
+@st.cache_data(max_entries=32)
+def build_swing_figure(content_hash, timeframe, threshold, mode, _pyramid, _swings_df):
+    plot_df = pd.DataFrame(_pyramid[timeframe])
+    swings_df = _swings_df
+
+    fig = go.Figure()
+    # Decimate the price line for the browser but never drop a bar that carries a swing
+    swing_bars = np.flatnonzero(plot_df["Date"].isin(swings_df["Date"]))
+    fig.add_trace(line_trace(plot_df["Date"], plot_df["High"], keep=swing_bars, mode='lines', name='Price', line=dict(color='royalblue')))
+
+    fig.add_trace(go.Scatter(
+        x=swings_df["Date"], y=swings_df["Price"], mode='markers+text',
+        marker=dict(
+            size=12,
+            color=['crimson' if t == 'Top' else 'green' for t in swings_df["Type"]],
+            symbol=['triangle-up' if t == 'Top' else 'triangle-down' for t in swings_df["Type"]]
+        ),
+        text=swings_df["CyclePosition"], textposition='top center',
+        name="Swings"
+    ))
+
+    fig.update_layout(title="Swing & Cycle Projections", hovermode='closest', height=600)
+    return fig
+
+@st.fragment
+def swing_chart_panel(fig):
+    """Chart and projection panel; a click reruns only this fragment, not the pipeline above it."""
+    selected_points = plotly_events(fig, click_event=True, select_event=False)
+
+    if selected_points:
+        selected_point = selected_points[0]
+        st.write(f"Selected Swing Date: {selected_point['x']}, Price: {selected_point['y']}")
+        projected_price = selected_point['y'] * 1.05
+        st.write(f"Projected Next Swing Price (5% move): {projected_price:.2f}")
+
+# Page function, rendered from the app.py sidebar
+def run_swing_cycle_projections():
     st.title("📈 Financial Market Oracle: Swing & Cycle Projections")
 
+    if st.radio("Mode", ["Single Symbol", "Batch Scan"], horizontal=True) == "Batch Scan":
+        batch_scan_page()
+        return
+
     uploaded_file = st.file_uploader("📂 Upload CSV", type="csv")
 
     if uploaded_file:
-        df = pd.read_csv(uploaded_file)
-        df.columns = df.columns.str.strip()
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-
-        for col in ['Open', 'High', 'Low', 'Close']:
-            df[col] = pd.to_numeric(df[col].astype(str).str.replace(',', ''), errors='coerce')
-
-        df.dropna(subset=['Date', 'Open', 'High', 'Low', 'Close'], inplace=True)
+        data = uploaded_file.getvalue()
+        content_hash = hashlib.sha256(data).hexdigest()
+        pyramid = build_bar_pyramid(content_hash, load_ohlc(content_hash, data))
 
         with st.sidebar:
             threshold = st.number_input("Threshold (%)", value=0.05, step=0.01, format="%.2f")
-            timeframe = st.selectbox("Timeframe", ["Daily", "Weekly"])
+            timeframe = st.selectbox("Timeframe", list(pyramid), index=list(pyramid).index("Daily"))
             swingmode = st.selectbox("Swing Type", ["HighLow", "Close"])
+            show_sweep = st.checkbox("Threshold Sweep (1%-20%)", value=False)
+            show_confluence = st.checkbox("Multi-Timeframe Confluence", value=False)
+
+        swings_df = compute_swings(content_hash, timeframe, threshold, swingmode, pyramid)
+
+        if show_confluence:
+            st.subheader("Multi-Timeframe Swing Confluence")
+            st.dataframe(compute_confluence(content_hash, threshold, swingmode, pyramid))
 
-        plot_df = df.copy()
-        if timeframe == 'Weekly':
-            plot_df = df.resample('W-MON', on='Date').agg({
-                'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last'
-            }).dropna().reset_index()
-
-        swings_df = detect_swings(plot_df, threshold, swingmode)
-
-        levels = generate_cycle_levels(max_price=50000)
-        swings_df['CycleFraction'] = swings_df['Price'].apply(lambda p: get_cycle_fraction(p, levels))
-        swings_df['CyclePosition'] = swings_df['CycleFraction'].apply(get_cycle_label)
-
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=plot_df["Date"], y=plot_df["High"], mode='lines', name='Price', line=dict(color='royalblue')))
-
-        fig.add_trace(go.Scatter(
-            x=swings_df["Date"], y=swings_df["Price"], mode='markers+text',
-            marker=dict(
-                size=12,
-                color=['crimson' if t == 'Top' else 'green' for t in swings_df["Type"]],
-                symbol=['triangle-up' if t == 'Top' else 'triangle-down' for t in swings_df["Type"]]
-            ),
-            text=swings_df["CyclePosition"], textposition='top center',
-            name="Swings"
-        ))
-
-        fig.update_layout(title="Swing & Cycle Projections", hovermode='closest', height=600)
-
-        selected_points = plotly_events(fig, click_event=True, select_event=False)
-
-        if selected_points:
-            selected_point = selected_points[0]
-            st.write(f"Selected Swing Date: {selected_point['x']}, Price: {selected_point['y']}")
-            projected_price = selected_point['y'] * 1.05
-            st.write(f"Projected Next Swing Price (5% move): {projected_price:.2f}")
+        if show_sweep:
+            st.subheader("Threshold Sweep")
+            st.dataframe(compute_sweep(content_hash, timeframe, swingmode, pyramid))
+
+        fig = build_swing_figure(content_hash, timeframe, threshold, swingmode, pyramid, swings_df)
+        swing_chart_panel(fig)
+
+# Standalone entry point
+def main():
+    st.set_page_config(layout="wide")
+    run_swing_cycle_projections()
 
 if __name__ == "__main__":
     main()
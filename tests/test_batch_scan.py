@@ -0,0 +1,26 @@
+import zipfile
+
+import pytest
+
+import swing_cycle_projections as scp
+
+@pytest.mark.parametrize("name, expected", [
+    ("AAPL.csv", True),
+    ("daily/MSFT.CSV", True),
+    ("__MACOSX/._AAPL.csv", False),
+    ("__MACOSX/daily/._MSFT.csv", False),
+    ("daily/._MSFT.csv", False),
+    ("notes.txt", False),
+])
+def test_is_symbol_csv(name, expected):
+    assert scp.is_symbol_csv(name) is expected
+
+def test_batch_scan_skips_resource_forks(tmp_path):
+    rows = "".join(f"2024-01-{day:02d},{100 + day},{101 + day},{99 + day},{100 + day}\n" for day in range(1, 29))
+    path = tmp_path / "symbols.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("AAPL.csv", "Date,Open,High,Low,Close\n" + rows)
+        archive.writestr("__MACOSX/._AAPL.csv", b"\x00\x05\x16\x07")
+    results = list(scp.batch_scan(str(path)))
+    assert [row["Symbol"] for row in results] == ["AAPL"]
+    assert "Error" not in results[0]
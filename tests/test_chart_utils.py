@@ -0,0 +1,43 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objs as go
+
+import swing_cycle_projections as scp
+from chart_utils import WEBGL_THRESHOLD, line_trace, lttb_indices
+
+def test_lttb_keeps_endpoints_and_spikes():
+    y = np.zeros(10_000)
+    y[4321] = 50.0
+    indices = lttb_indices(np.arange(len(y)), y, 500)
+    assert len(indices) <= 500
+    assert indices[0] == 0 and indices[-1] == len(y) - 1
+    assert 4321 in indices
+
+def test_short_series_is_not_decimated():
+    assert np.array_equal(lttb_indices(np.arange(10), np.arange(10), 500), np.arange(10))
+
+def test_line_trace_switches_to_webgl_for_long_series():
+    n = WEBGL_THRESHOLD + 1
+    assert isinstance(line_trace(np.arange(n), np.random.default_rng(0).random(n)), go.Scattergl)
+    assert isinstance(line_trace(np.arange(100), np.arange(100)), go.Scatter)
+
+def test_tz_aware_swing_bars_are_kept():
+    rng = np.random.default_rng(7)
+    n = 20_000
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    df = pd.DataFrame({
+        "Date": pd.date_range("2024-01-02 09:30", periods=n, freq="min", tz="America/New_York"),
+        "Open": close, "High": close * 1.001, "Low": close * 0.999, "Close": close,
+    })
+    swings = scp.detect_swings(df, threshold=0.02)
+    assert swings["Date"].dt.tz == df["Date"].dt.tz
+
+    swing_bars = np.flatnonzero(df["Date"].isin(swings["Date"]))
+    assert len(swing_bars) == len(swings)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        trace = line_trace(df["Date"], df["High"], keep=swing_bars)
+    assert len(trace.x) < n
+    assert set(swings["Date"]) <= set(pd.to_datetime(trace.x))
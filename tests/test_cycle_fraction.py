@@ -0,0 +1,60 @@
+import bisect
+
+import numpy as np
+import pytest
+
+import swing_cycle_projections as scp
+
+# Reference copies of the list-and-bisect implementation cycle_fraction replaced; the page
+# built its levels with max_price=50000 and results must stay identical below that.
+def generate_cycle_levels(start=1.0, max_price=1e9):
+    levels = [start]
+    current = start
+    while current < max_price:
+        current = (np.sqrt(current) + 0.25) ** 2
+        levels.append(current)
+    return levels
+
+def get_cycle_fraction(price, levels):
+    if price <= levels[0]:
+        return 0.0
+    if price >= levels[-1]:
+        return (len(levels)-1)/9.0
+    idx = bisect.bisect_right(levels, price)
+    low, high = levels[idx-1], levels[idx]
+    return (idx-1 + (price - low) / (high - low))/9.0
+
+LEVELS = generate_cycle_levels(max_price=50000)
+
+def reference_prices():
+    """Every level below 50000 with its floating-point neighbours, plus spread-out and sub-1 prices."""
+    levels = np.array([level for level in LEVELS if level < 50000])
+    rng = np.random.default_rng(14)
+    prices = np.concatenate([
+        levels,
+        np.nextafter(levels, 0),
+        np.nextafter(levels, np.inf),
+        rng.uniform(0, 50000, 100_000),
+        np.exp(rng.uniform(0, np.log(50000), 100_000)),
+        [0.0, 0.5, 1.0, 49999.99],
+    ])
+    return prices[prices < 50000]
+
+PRICES = reference_prices()
+
+def test_fractions_match_reference_below_50000():
+    expected = np.array([get_cycle_fraction(price, LEVELS) for price in PRICES.tolist()])
+    np.testing.assert_array_equal(scp.cycle_fraction(PRICES), expected)
+
+def test_labels_match_reference_below_50000():
+    expected = [scp.get_cycle_label(get_cycle_fraction(price, LEVELS)) for price in PRICES.tolist()]
+    assert scp.cycle_label(scp.cycle_fraction(PRICES)).tolist() == expected
+
+def test_levels_match_generated_levels():
+    np.testing.assert_array_equal(scp.cycle_level(np.arange(len(LEVELS))), LEVELS)
+
+@pytest.mark.parametrize("price", [60_000.0, 1e6, 1e9])
+def test_prices_above_old_cap_are_not_clamped(price):
+    fraction = scp.cycle_fraction([price])[0]
+    n = int(fraction * scp.LEVELS_PER_CYCLE)
+    assert scp.cycle_level(n) <= price < scp.cycle_level(n + 1)
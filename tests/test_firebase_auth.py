@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+import firebase_auth
+
+class CountingVerifier:
+    """Local stand-in for auth.verify_id_token: accepts tokens starting with 'good' and counts calls."""
+
+    def __init__(self, lifetime=3600):
+        self.lifetime = lifetime
+        self.calls = 0
+
+    def __call__(self, token):
+        self.calls += 1
+        if not token.startswith("good"):
+            raise ValueError("invalid token")
+        return {"uid": token, "exp": time.time() + self.lifetime}
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    firebase_auth.get_token_cache.clear()
+    yield
+    firebase_auth.get_token_cache.clear()
+
+def test_verified_token_is_served_from_cache():
+    verifier = CountingVerifier()
+    first = firebase_auth.verify_user("good-1", verifier)
+    assert firebase_auth.verify_user("good-1", verifier) is first
+    assert verifier.calls == 1
+
+def test_expired_entry_is_verified_again():
+    verifier = CountingVerifier(lifetime=-1)
+    firebase_auth.verify_user("good-1", verifier)
+    firebase_auth.verify_user("good-1", verifier)
+    assert verifier.calls == 2
+
+def test_invalid_token_is_not_cached():
+    verifier = CountingVerifier()
+    assert firebase_auth.verify_user("bad", verifier) is None
+    assert firebase_auth.verify_user("bad", verifier) is None
+    assert verifier.calls == 2
+
+def test_cache_evicts_least_recently_used():
+    cache = firebase_auth.TokenCache(max_entries=2)
+    claims = {"exp": time.time() + 3600}
+    cache.put("a", claims)
+    cache.put("b", claims)
+    cache.get("a")
+    cache.put("c", claims)
+    assert cache.get("b") is None
+    assert cache.get("a") is claims and cache.get("c") is claims
@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import swing_cycle_projections as scp
+
+OFFSET_CSV = (
+    b"Date,Open,High,Low,Close\n"
+    b"2024-01-02T09:15:00+05:30,100,101,99,100.5\n"
+    b"2024-01-02T09:16:00+05:30,100.5,102,100,101.5\n"
+)
+
+NAIVE_CSV = b"Date,Open,High,Low,Close\n2024-01-02,1,2,0.5,1.5\n2024-01-03,1.5,2.5,1,2\n"
+
+@pytest.fixture(autouse=True)
+def upload_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(scp, "UPLOAD_CACHE_DIR", str(tmp_path))
+    scp.load_ohlc.clear()
+    yield tmp_path
+    scp.load_ohlc.clear()
+
+@pytest.mark.parametrize("data", [OFFSET_CSV, NAIVE_CSV])
+def test_disk_cache_round_trip(data):
+    fresh = scp.load_ohlc("hash", data)
+    scp.load_ohlc.clear()
+    cached = scp.load_ohlc("hash", data)
+    pd.testing.assert_frame_equal(cached, fresh)
+
+def test_cache_file_has_no_object_arrays(upload_cache):
+    scp.load_ohlc("hash", OFFSET_CSV)
+    with np.load(upload_cache / "hash.npz") as columns:
+        assert columns["Date"].dtype == np.dtype("datetime64[ns]")
+        assert str(columns["tz"]) == "UTC+05:30"
+
+def test_unreadable_cache_file_is_replaced(upload_cache):
+    # A file with a pickled object array, as written before dates were stored in UTC
+    with open(upload_cache / "hash.npz", "wb") as f:
+        np.savez(f, Date=np.array([pd.Timestamp("2024-01-02", tz="UTC")], dtype=object))
+    df = scp.load_ohlc("hash", OFFSET_CSV)
+    assert str(df["Date"].dt.tz) == "UTC+05:30"
+    scp.load_ohlc.clear()
+    pd.testing.assert_frame_equal(scp.load_ohlc("hash", OFFSET_CSV), df)
+
+def test_non_numeric_fallback_gives_float64():
+    df = scp.parse_ohlc_csv(b"Date,Open,High,Low,Close\n2024-01-02,1,x,1,2\n2024-01-03,2,3,1,2\n")
+    assert (df[scp.OHLC_COLUMNS].dtypes == "float64").all()
+    assert len(df) == 1
+
+def test_cache_is_pruned_least_recently_used_first(upload_cache, monkeypatch):
+    for i, name in enumerate(["old", "mid", "new"]):
+        scp.load_ohlc(name, NAIVE_CSV)
+        os.utime(upload_cache / f"{name}.npz", (i, i))
+    scp.load_ohlc.clear()
+    scp.load_ohlc("old", NAIVE_CSV)
+
+    size = (upload_cache / "new.npz").stat().st_size
+    monkeypatch.setattr(scp, "UPLOAD_CACHE_MAX_BYTES", 2 * size)
+    scp.load_ohlc("newest", NAIVE_CSV)
+    assert sorted(p.stem for p in upload_cache.glob("*.npz")) == ["newest", "old"]
@@ -0,0 +1,31 @@
+import numpy as np
+
+import combined_page as cp
+
+NAMES = ["Apple Inc", "Tesla", "NIFTY 50", "Bank of America", "Zoë", "", "x", "Reliance Industries", "Tesla"]
+
+def test_reduce_numbers_matches_scalar():
+    values = np.arange(0, 20000)
+    np.testing.assert_array_equal(cp.reduce_numbers(values), [cp.reduce_to_single_digit(int(v)) for v in values])
+
+def test_score_names_matches_scalar():
+    scores = cp.score_names(NAMES)
+    assert scores["Chaldean"].tolist() == [cp.chaldean_numerology(name) for name in NAMES]
+    assert scores["Pythagorean"].tolist() == [cp.pythagorean_numerology(name) for name in NAMES]
+
+def test_index_query_matches_scoring():
+    index = cp.build_numerology_index(NAMES)
+    scores = cp.score_names(sorted(set(NAMES)))
+    for system in cp.NUMEROLOGY_TABLES:
+        for reduced in cp.REDUCED_VALUES:
+            expected = set(scores.loc[scores[system] == reduced, "Input"])
+            assert set(index.query(system, reduced)["Name"]) == expected
+        raw_sum = int(scores[f"{system} Sum"].iloc[0])
+        found = index.query(system, cp.reduce_to_single_digit(raw_sum), raw_sum)
+        assert (found["Raw Sum"] == raw_sum).all() and len(found) >= 1
+
+def test_variants_hit_target():
+    variants = cp.variants_for_target("Jackson", "Chaldean", 5, max_edits=2)
+    assert len(variants) > 0
+    assert all(cp.chaldean_numerology(variant) == 5 for variant in variants["Variant"])
+    assert variants["Edits"].is_monotonic_increasing
@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+
+import orbital_and_gravitational_plotter as ogp
+
+START_JD = 2460310.5
+
+@pytest.fixture
+def computed(monkeypatch):
+    """Fake ephemeris: distance is the Julian date itself; records the days each call evaluated."""
+    calls = []
+    def compute_positions(obj, observation_times, engine='astropy'):
+        calls.append(list(observation_times.jd - START_JD))
+        return pd.DataFrame({'distance': observation_times.jd, 'ra': 0.0, 'dec': 0.0},
+                            index=pd.DatetimeIndex(observation_times.datetime, name='Date'))
+    monkeypatch.setattr(ogp, "compute_positions", compute_positions)
+    return calls
+
+def test_contained_window_is_sliced(computed):
+    cache = ogp.PositionCache()
+    cache.get_positions('mars', START_JD, 30)
+    positions = cache.get_positions('mars', START_JD + 5, 10)
+    assert list(positions['distance'] - START_JD) == list(range(5, 15))
+    assert len(computed) == 1
+
+def test_overlapping_windows_compute_only_missing_days(computed):
+    cache = ogp.PositionCache()
+    cache.get_positions('mars', START_JD, 30)
+    tail = cache.get_positions('mars', START_JD + 20, 30)
+    head = cache.get_positions('mars', START_JD - 10, 15)
+    assert computed[1:] == [list(range(30, 50)), list(range(-10, 0))]
+    assert list(tail['distance'] - START_JD) == list(range(20, 50))
+    assert list(head['distance'] - START_JD) == list(range(-10, 5))
+    assert list(cache._entries) == [('mars', 'astropy', START_JD - 10, 60)]
+    assert cache.nbytes == cache._entries[('mars', 'astropy', START_JD - 10, 60)].memory_usage(index=True).sum()
+
+def test_other_engine_or_disjoint_window_is_computed(computed):
+    cache = ogp.PositionCache()
+    cache.get_positions('mars', START_JD, 10)
+    cache.get_positions('mars', START_JD, 10, engine='jplephem')
+    cache.get_positions('mars', START_JD + 40, 10)
+    assert len(computed) == 3 and len(cache._entries) == 3
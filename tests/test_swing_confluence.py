@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+import swing_cycle_projections as scp
+
+def daily_bars(path, start="2020-01-01"):
+    """Daily OHLC bars whose Low/High equal the close path, so extremes carry over to every rollup."""
+    close = np.asarray(path, dtype=float)
+    return pd.DataFrame({
+        "Date": pd.date_range(start, periods=len(close), freq="D"),
+        "Open": close, "High": close, "Low": close, "Close": close,
+    })
+
+def v_path(*levels, steps=60):
+    """Piecewise-linear path through `levels`."""
+    return np.concatenate([np.linspace(a, b, steps, endpoint=False) for a, b in zip(levels, levels[1:])] + [[levels[-1]]])
+
+def pyramid_for(df):
+    return scp.build_bar_pyramid(pd.util.hash_pandas_object(df).sum(), df)
+
+def test_equal_prices_far_apart_are_not_confluent():
+    # Lows at exactly 100 in April and December 2020; only the April one is also a quarterly swing
+    df = daily_bars(v_path(150, 100, 200, 100, 200, steps=120))
+    swings = scp.swing_confluence(pyramid_for(df), threshold=0.05)
+    lows = swings[(swings.Type == "Low") & (swings.Price == 100)].set_index(["Timeframe", "Date"]).Confluence
+    assert lows[("Daily", pd.Timestamp("2020-04-30"))] == 4
+    assert lows[("Quarterly", pd.Timestamp("2020-06-30"))] == 4
+    assert lows[("Daily", pd.Timestamp("2020-12-26"))] == 3
+    assert lows[("Weekly", pd.Timestamp("2020-12-28"))] == 3
+
+def test_same_extreme_counts_every_timeframe_containing_it():
+    df = daily_bars(v_path(150, 100, 200, steps=120))
+    swings = scp.swing_confluence(pyramid_for(df), threshold=0.05)
+    assert set(swings.Timeframe) == {"Daily", "Weekly", "Monthly", "Quarterly"}
+    assert (swings.Confluence == 4).all()
+
+def test_tz_aware_bars_keep_their_timezone():
+    df = daily_bars(v_path(150, 100, 200, 100, 200, steps=120))
+    df["Date"] = df["Date"].dt.tz_localize("Asia/Kolkata")
+    pyramid = pyramid_for(df)
+    assert all(level["Date"].dtype == df["Date"].dtype for level in pyramid.values())
+
+    swings = scp.swing_confluence(pyramid, threshold=0.05)
+    assert swings.Date.dt.tz == df["Date"].dt.tz
+    lows = swings[(swings.Type == "Low") & (swings.Price == 100)].set_index(["Timeframe", "Date"]).Confluence
+    assert lows[("Daily", pd.Timestamp("2020-04-30", tz="Asia/Kolkata"))] == 4
+    assert lows[("Daily", pd.Timestamp("2020-12-26", tz="Asia/Kolkata"))] == 3
+
+def test_bar_spans_contain_their_daily_bars():
+    dates = pd.Series(pd.to_datetime(["2024-01-01", "2024-03-31", "2024-06-30"]))
+    start, end = scp.bar_spans("Quarterly", dates)
+    assert list(start) == list(pd.to_datetime(["2023-10-01", "2024-01-01", "2024-04-01"]))
+    assert list(end) == list(pd.to_datetime(["2024-01-02", "2024-04-01", "2024-07-01"]))
+    start, end = scp.bar_spans("Weekly", pd.Series(pd.to_datetime(["2024-01-08"])))
+    assert (start[0], end[0]) == (pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-09"))
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import swing_cycle_projections as scp
+
+def random_bars(n=3000, seed=13):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    spread = close * rng.uniform(0, 0.01, n)
+    return pd.DataFrame({
+        "Date": pd.date_range("2015-01-01", periods=n, freq="D"),
+        "Open": close, "High": close + spread, "Low": close - spread, "Close": close,
+    })
+
+BARS = random_bars()
+
+@pytest.mark.parametrize("mode", ["HighLow", "Close"])
+@pytest.mark.parametrize("threshold", [0.01, 0.05, 0.1])
+def test_bar_by_bar_matches_detect_swings(mode, threshold):
+    detector = scp.SwingDetector(threshold, mode)
+    swings = [detector.update(row.Date, row.High, row.Low, row.Close) for row in BARS.itertuples()]
+    found = pd.DataFrame([swing for swing in swings if swing is not None], columns=["Date", "Price", "Type"])
+    pd.testing.assert_frame_equal(found, scp.detect_swings(BARS, threshold, mode))
+
+@pytest.mark.parametrize("mode", ["HighLow", "Close"])
+def test_batches_with_checkpoints_match_detect_swings(mode):
+    rng = np.random.default_rng(7)
+    cuts = np.sort(rng.choice(np.arange(1, len(BARS)), 40, replace=False))
+    detector = scp.SwingDetector(0.03, mode)
+    found = []
+    for batch in np.split(np.arange(len(BARS)), cuts):
+        found.append(detector.update_many(BARS.iloc[batch]))
+        detector = scp.SwingDetector.restore(detector.checkpoint())
+    found = pd.concat([swings for swings in found if len(swings)], ignore_index=True)
+    pd.testing.assert_frame_equal(found, scp.detect_swings(BARS, 0.03, mode))